@@ -4,9 +4,21 @@ from .aegis_integrity import (
     StructuralRange, 
     GeometricManifest, 
     GridLawDetector, 
+    PageProfile,
+    IncrementalGridLawDetector,
     IntegrityPipe,
-    GeometricChunk
+    GeometricChunk,
+    ChunkPlan,
+    ChunkPlanCache,
+    ChunkIndex,
+    FrozenManifest,
+    ManifestChunkingPool,
+    AtomTable,
+    BatchIntegrityPipe,
+    encode_manifest
 )
+from .manifest_store import ManifestStore
+from .embedding_scheduler import EmbeddingBatch, EmbeddingBatchScheduler
 
 __all__ = [
     "GeometricAtom",
@@ -14,6 +26,19 @@ __all__ = [
     "StructuralRange",
     "GeometricManifest",
     "GridLawDetector",
+    "PageProfile",
+    "IncrementalGridLawDetector",
     "IntegrityPipe",
-    "GeometricChunk"
+    "GeometricChunk",
+    "ChunkPlan",
+    "ChunkPlanCache",
+    "ChunkIndex",
+    "FrozenManifest",
+    "ManifestChunkingPool",
+    "AtomTable",
+    "BatchIntegrityPipe",
+    "encode_manifest",
+    "ManifestStore",
+    "EmbeddingBatch",
+    "EmbeddingBatchScheduler"
 ]
@@ -1,7 +1,18 @@
+import hashlib
 import logging
 import math
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Sequence as SequenceABC
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Generator, Optional
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Generator, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +41,8 @@ class GeometricManifest:
     def __init__(self, atoms: List[GeometricAtom], structures: List[StructuralRange]):
         """
         Maintains a pre-computed Interval Map for O(1) structural verification.
+        IntegrityPipe only reads the manifest, but nothing stops callers mutating it;
+        use FrozenManifest.freeze() to share one manifest across threads or processes.
         """
         if atoms is None:
             raise ValueError("GeometricManifest requires a non-null atoms list.")
@@ -53,24 +66,357 @@ class GeometricManifest:
             return self._index_map[atom_index]
         return []
 
+    def fingerprint(self) -> str:
+        """
+        Hash of the inputs a chunk plan depends on: the token-count column and the structures.
+        Recomputed on every call (a single pass over packed integers), so it tracks mutations.
+        """
+        digest = hashlib.sha256()
+        tokens = self.token_counts()
+        digest.update(tokens if isinstance(tokens, memoryview) else array("q", tokens))
+        for s in self.structures:
+            digest.update(f"S|{s.start}|{s.end}|{s.type}\x00".encode("utf-8"))
+        return digest.hexdigest()
+
+    def token_counts(self) -> Sequence[int]:
+        """Per-atom token counts, in atom order."""
+        return [a.token_count for a in self.atoms]
+
+    def _span_fields(self, start: int, end: int) -> Tuple[str, int, int, int]:
+        """Joined text, first page, first and last atom index of atoms [start, end)."""
+        atoms = self.atoms[start:end]
+        return " ".join(a.text for a in atoms), atoms[0].page, atoms[0].index, atoms[-1].index
+
+
+# Binary manifest layout (native little-endian, 8-byte aligned columns):
+#   header | x, y, width, height (f64) | page, token_count, index (i64) | text offsets (u64, n + 1)
+#   | structure start, end (i64) | type offsets (u64, m + 1) | atom text blob | type blob
+# Each atom text is followed by one space in the blob, so a span's joined text is a single slice.
+_MANIFEST_MAGIC = b"AGM1"
+_MANIFEST_VERSION = 2
+_MANIFEST_HEADER = struct.Struct("<4sHxxQQQQ")
+
+
+def encode_manifest(manifest: GeometricManifest) -> bytes:
+    """Serializes a manifest into the columnar buffer layout read by FrozenManifest."""
+    if sys.byteorder != "little":
+        raise NotImplementedError("Manifest buffers are only supported on little-endian hosts.")
+
+    atoms = manifest.atoms
+    structures = manifest.structures
+    columns = [array("d") for _ in range(4)] + [array("q") for _ in range(3)]
+    text_offsets = array("Q", [0])
+    text_blob = bytearray()
+    for a in atoms:
+        b = a.bounds
+        for column, value in zip(columns, (b.x, b.y, b.width, b.height, a.page, a.token_count, a.index)):
+            column.append(value)
+        text_blob += a.text.encode("utf-8")
+        text_blob += b" "
+        text_offsets.append(len(text_blob))
+
+    s_starts = array("q", (s.start for s in structures))
+    s_ends = array("q", (s.end for s in structures))
+    type_offsets = array("Q", [0])
+    type_blob = bytearray()
+    for s in structures:
+        type_blob += s.type.encode("utf-8")
+        type_offsets.append(len(type_blob))
+
+    header = _MANIFEST_HEADER.pack(_MANIFEST_MAGIC, _MANIFEST_VERSION, len(atoms), len(structures), len(text_blob), len(type_blob))
+    parts = [header] + [c.tobytes() for c in columns] + [text_offsets.tobytes(), s_starts.tobytes(), s_ends.tobytes(), type_offsets.tobytes(), bytes(text_blob), bytes(type_blob)]
+    return b"".join(parts)
+
+
+class _AtomView(SequenceABC):
+    """Read-only sequence that decodes GeometricAtoms from a manifest buffer on access."""
+    def __init__(self, buf: memoryview, offset: int, count: int, text_base: int):
+        self._views: List[memoryview] = []
+        self._count = count
+        f64 = 8 * count
+
+        def column(fmt: str, length: int) -> memoryview:
+            nonlocal offset
+            view = buf[offset:offset + length].cast(fmt)
+            self._views.append(view)
+            offset += length
+            return view
+
+        self._x = column("d", f64)
+        self._y = column("d", f64)
+        self._w = column("d", f64)
+        self._h = column("d", f64)
+        self._page = column("q", f64)
+        self._tokens = column("q", f64)
+        self._index = column("q", f64)
+        self._text_offsets = column("Q", f64 + 8)
+        self._text = buf
+        self._text_base = text_base
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._atom(i) for i in range(*item.indices(self._count))]
+        if item < 0:
+            item += self._count
+        if not 0 <= item < self._count:
+            raise IndexError("atom index out of range")
+        return self._atom(item)
+
+    def _atom(self, i: int) -> GeometricAtom:
+        base = self._text_base
+        text = str(self._text[base + self._text_offsets[i]:base + self._text_offsets[i + 1] - 1], "utf-8")
+        return GeometricAtom(
+            text=text,
+            bounds=BoundingBox(self._x[i], self._y[i], self._w[i], self._h[i]),
+            page=self._page[i],
+            token_count=self._tokens[i],
+            index=self._index[i]
+        )
+
+    def token_counts(self) -> memoryview:
+        return self._tokens
+
+    def span_fields(self, start: int, end: int) -> Tuple[str, int, int, int]:
+        base = self._text_base
+        text = str(self._text[base + self._text_offsets[start]:base + self._text_offsets[end] - 1], "utf-8")
+        return text, self._page[start], self._index[start], self._index[end - 1]
+
+    def release(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+
+
+class FrozenManifest(GeometricManifest):
+    """
+    Immutable, buffer-backed manifest that is safe to share across threads, and across
+    processes through shared memory. Atoms are decoded on access from a read-only columnar
+    buffer, so concurrent readers never share mutable atoms and nothing is copied per reader;
+    chunking renders straight from the columns without decoding atoms at all.
+    The StructuralRange instances in structures are shared by all readers: treat them as read-only.
+    """
+    def __init__(self, buffer, shared_memory_block: Optional[Any] = None):
+        buf = memoryview(buffer).cast("B").toreadonly()
+        magic, version, atom_count, structure_count, text_bytes, type_bytes = _MANIFEST_HEADER.unpack_from(buf, 0)
+        if magic != _MANIFEST_MAGIC or version != _MANIFEST_VERSION:
+            raise ValueError("Buffer does not contain an Aegis manifest.")
+
+        structures_offset = _MANIFEST_HEADER.size + 8 * (8 * atom_count + 1)
+        text_base = structures_offset + 8 * (3 * structure_count + 1)
+        type_base = text_base + text_bytes
+        if len(buf) < type_base + type_bytes:
+            raise ValueError("Manifest buffer is truncated.")
+
+        atoms = _AtomView(buf, _MANIFEST_HEADER.size, atom_count, text_base)
+        s_fields = struct.unpack_from(f"<{2 * structure_count}q{structure_count + 1}Q", buf, structures_offset)
+
+        starts, ends = s_fields[:structure_count], s_fields[structure_count:2 * structure_count]
+        type_offsets = s_fields[2 * structure_count:]
+        structures = tuple(
+            StructuralRange(starts[i], ends[i], str(buf[type_base + type_offsets[i]:type_base + type_offsets[i + 1]], "utf-8"))
+            for i in range(structure_count)
+        )
+
+        # Sparse, immutable variant of the GIP 2.3 Structural Index Map
+        index_map: Dict[int, Tuple[StructuralRange, ...]] = {}
+        for s in structures:
+            safe_start = max(0, min(s.start, atom_count - 1))
+            safe_end = max(0, min(s.end, atom_count - 1))
+            for i in range(safe_start, safe_end + 1):
+                index_map[i] = index_map.get(i, ()) + (s,)
+
+        object.__setattr__(self, "_buffer", buf)
+        object.__setattr__(self, "_shared_memory", shared_memory_block)
+        object.__setattr__(self, "atoms", atoms)
+        object.__setattr__(self, "structures", structures)
+        object.__setattr__(self, "_index_map", index_map)
+        object.__setattr__(self, "_fingerprint", None)  # Safe to memoize: the buffer never changes
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenManifest is immutable.")
+
+    @classmethod
+    def freeze(cls, manifest: GeometricManifest) -> "FrozenManifest":
+        """Returns a frozen copy of the manifest (or the manifest itself if already frozen)."""
+        if isinstance(manifest, FrozenManifest):
+            return manifest
+        return cls(encode_manifest(manifest))
+
+    @classmethod
+    def attach(cls, name: str) -> "FrozenManifest":
+        """
+        Maps a manifest previously published with to_shared_memory, without copying it.
+        The attaching process never owns the block: it is detached from the resource tracker
+        so a worker exiting cannot unlink memory the publisher and other workers still use.
+        Only POSIX registers blocks with the tracker; Windows frees them with the last handle.
+        """
+        from multiprocessing import shared_memory
+
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            block = shared_memory.SharedMemory(name=name)
+            if os.name == "posix":
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(block._name, "shared_memory")
+        return cls(block.buf, shared_memory_block=block)
+
+    def to_shared_memory(self, name: Optional[str] = None) -> "shared_memory.SharedMemory":
+        """
+        Publishes the manifest buffer to a new shared memory block for other processes to attach.
+        The caller owns the block and must close() and unlink() it when done.
+        """
+        from multiprocessing import shared_memory
+
+        block = shared_memory.SharedMemory(name=name, create=True, size=max(1, len(self._buffer)))
+        block.buf[:len(self._buffer)] = self._buffer
+        return block
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    def get_structures_at(self, atom_index: int) -> Tuple[StructuralRange, ...]:
+        """O(1) lookup for structures containing the given atom."""
+        return self._index_map.get(atom_index, ())
+
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            object.__setattr__(self, "_fingerprint", GeometricManifest.fingerprint(self))
+        return self._fingerprint
+
+    def token_counts(self) -> Sequence[int]:
+        return self.atoms.token_counts()
+
+    def _span_fields(self, start: int, end: int) -> Tuple[str, int, int, int]:
+        return self.atoms.span_fields(start, end)
+
+    def close(self):
+        """Releases the buffer views and detaches from shared memory, if attached."""
+        self.atoms.release()
+        self._buffer.release()
+        if self._shared_memory is not None:
+            self._shared_memory.close()
+
+
+@dataclass
+class PageProfile:
+    """Cheap per-page statistics from the Grid Law pre-pass."""
+    page: int
+    atom_count: int
+    row_count: int
+    multi_atom_rows: int
+    max_atoms_per_row: int
+    x_start_spread: float
+    may_contain_table: bool
+
 
 class GridLawDetector:
     """
     Detects tabular structures by analyzing spatial frequency and alignment of atoms.
     No OCR required. Pure coordinate math.
+    Stateless: one detector may be shared across threads.
     """
     ALIGNMENT_THRESHOLD = 5.0  # Points (variance allowed)
 
-    def detect_table_zones(self, atoms: List[GeometricAtom], direction: str = "LTR") -> List[StructuralRange]:
+    def detect_table_zones(self, atoms: List[GeometricAtom], direction: str = "LTR", prefilter: bool = True) -> List[StructuralRange]:
         """
         Detects tabular structures. 
         :param direction: "LTR" (Left-to-Right) or "RTL" (Right-to-Left)
+        :param prefilter: Skip full analysis when the linear pre-pass proves no two rows can align
         """
         if not atoms:
             return []
 
         logger.info(f"Discovery Started for Page {atoms[0].page} with {len(atoms)} atoms.")
 
+        if prefilter and not self._may_contain_table(self._row_profiles(atoms)):
+            logger.debug(f"Pre-pass: no alignable rows on Page {atoms[0].page}; Grid Law skipped.")
+            return []
+
+        return self._detect_rows(atoms, direction)
+
+    def detect_document_zones(self, atoms: List[GeometricAtom], direction: str = "LTR") -> List[StructuralRange]:
+        """
+        Runs Grid Law discovery page by page, routing only pages that may hold tables
+        into full detection. Equivalent to calling detect_table_zones on each page.
+        """
+        zones = []
+        for profile, page_atoms in self._profile_pages(atoms):
+            if profile.may_contain_table:
+                logger.info(f"Discovery Started for Page {profile.page} with {profile.atom_count} atoms.")
+                zones.extend(self._detect_rows(page_atoms, direction))
+            else:
+                logger.debug(f"Pre-pass: Page {profile.page} classified as prose; Grid Law skipped.")
+        return zones
+
+    def classify_pages(self, atoms: List[GeometricAtom]) -> List[PageProfile]:
+        """Per-page pre-pass statistics, in order of first appearance, for routing and instrumentation."""
+        return [profile for profile, _ in self._profile_pages(atoms)]
+
+    def _profile_pages(self, atoms: List[GeometricAtom]) -> List[Tuple[PageProfile, List[GeometricAtom]]]:
+        pages: Dict[int, List[GeometricAtom]] = {}
+        for atom in atoms:
+            pages.setdefault(atom.page, []).append(atom)
+
+        result = []
+        for page, page_atoms in pages.items():
+            rows = self._row_profiles(page_atoms)
+            starts = [r[1] for r in rows.values()]
+            result.append((PageProfile(
+                page=page,
+                atom_count=len(page_atoms),
+                row_count=len(rows),
+                multi_atom_rows=sum(1 for r in rows.values() if r[0] >= 2),
+                max_atoms_per_row=max(r[0] for r in rows.values()),
+                x_start_spread=max(starts) - min(starts),
+                may_contain_table=self._may_contain_table(rows)
+            ), page_atoms))
+        return result
+
+    @staticmethod
+    def _row_profiles(atoms: List[GeometricAtom]) -> Dict[float, List[float]]:
+        """One linear sweep: row key -> [atom count, min rounded X, max rounded X]."""
+        rows: Dict[float, List[float]] = {}
+        for atom in atoms:
+            y_key = round(atom.bounds.y, 1)
+            x = round(atom.bounds.x, 0)
+            row = rows.get(y_key)
+            if row is None:
+                rows[y_key] = [1, x, x]
+            else:
+                row[0] += 1
+                if x < row[1]:
+                    row[1] = x
+                elif x > row[2]:
+                    row[2] = x
+        return rows
+
+    def _may_contain_table(self, rows: Dict[float, List[float]]) -> bool:
+        """
+        Necessary condition for any aligned row pair: both rows hold the same number (>= 2)
+        of atoms, and their first and last X-starts each agree within ALIGNMENT_THRESHOLD
+        (reading-order sorting puts the row extremes at both ends, for LTR and RTL alike).
+        Bucketing by threshold-sized cells means close values land in the same or adjacent
+        cell, so probing the 3x3 neighbourhood never misses a pair the full detector would align.
+        """
+        width = self.ALIGNMENT_THRESHOLD or 1.0
+        seen = set()
+        for count, min_x, max_x in rows.values():
+            if count < 2:
+                continue
+            key = (count, math.floor(min_x / width), math.floor(max_x / width))
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if (count, key[1] + dx, key[2] + dy) in seen:
+                        return True
+            seen.add(key)
+        return False
+
+    def _detect_rows(self, atoms: List[GeometricAtom], direction: str) -> List[StructuralRange]:
         zones = []
         
         # Group atoms into horizontal lines (clustered by Y coordinate)
@@ -93,12 +439,8 @@ class GridLawDetector:
         sorted_y = sorted(rows_dict.keys(), reverse=True)
         rows = [rows_dict[y] for y in sorted_y]
         
-        # Ensure atoms in each row are sorted by reading order
-        for r in rows:
-            if direction == "RTL":
-                r.sort(key=lambda a: a.bounds.x, reverse=True)
-            else:
-                r.sort(key=lambda a: a.bounds.x)
+        # Ensure atoms in each row are sorted by reading order (into new lists; inputs are never mutated)
+        rows = [sorted(r, key=lambda a: a.bounds.x, reverse=(direction == "RTL")) for r in rows]
 
         start_row_index: Optional[int] = None
 
@@ -156,6 +498,118 @@ class GridLawDetector:
         return True
 
 
+class IncrementalGridLawDetector:
+    """
+    Stateful Grid Law discovery for append-only atom streams delivered page by page.
+    Only the open page's row and table state is kept, and rows are aligned as they close,
+    so discovery cost is linear in document length. Zones match
+    GridLawDetector.detect_document_zones over all atoms appended so far.
+
+    This is deliberately the per-page result, not detect_table_zones over the whole list:
+    that call groups rows by Y across pages, so tables on different pages that share row
+    positions merge into one zone spanning both pages.
+    """
+    def __init__(self, direction: str = "LTR", detector: Optional[GridLawDetector] = None):
+        self.direction = direction
+        self.detector = detector or GridLawDetector()
+        self._zones: List[StructuralRange] = []
+        self._closed_pages = set()
+        self._page: Optional[int] = None
+        self._reset_page()
+
+    @property
+    def zones(self) -> List[StructuralRange]:
+        """Zones on closed pages."""
+        return list(self._zones)
+
+    @property
+    def open_zones(self) -> List[StructuralRange]:
+        """
+        Provisional zones on the open page, including the tail zone still being extended.
+        Final once the page closes; out-of-order rows fall back to a full page re-run.
+        """
+        if not self._ordered:
+            return []
+        pending = list(self._page_zones)
+        if self._zone is not None:
+            pending.append(StructuralRange(self._zone[0], self._zone[1], "Table"))
+        return pending
+
+    def append(self, atoms: Iterable[GeometricAtom]) -> List[StructuralRange]:
+        """Consumes appended atoms; returns the zones of any pages this append closed."""
+        closed: List[StructuralRange] = []
+        for atom in atoms:
+            if atom.page != self._page:
+                if atom.page in self._closed_pages:
+                    raise ValueError(f"Page {atom.page} was already closed; pages must arrive contiguously.")
+                closed.extend(self._close_page())
+                self._page = atom.page
+            self._page_atoms.append(atom)
+            if self._ordered:
+                self._push(atom)
+        return closed
+
+    def finish(self) -> List[StructuralRange]:
+        """Closes the open page and returns its zones."""
+        return self._close_page()
+
+    def _reset_page(self):
+        self._page_atoms: List[GeometricAtom] = []
+        self._ordered = True
+        self._row_key: Optional[float] = None
+        self._row: List[GeometricAtom] = []
+        self._prev_row: Optional[List[GeometricAtom]] = None
+        self._zone: Optional[List[int]] = None  # [min atom index, max atom index] of the tail zone
+        self._page_zones: List[StructuralRange] = []
+
+    def _push(self, atom: GeometricAtom):
+        y_key = round(atom.bounds.y, 1)
+        if self._row_key is None or y_key == self._row_key:
+            self._row_key = y_key
+            self._row.append(atom)
+        elif y_key < self._row_key:
+            self._close_row()
+            self._row_key = y_key
+            self._row = [atom]
+        else:
+            # Rows must arrive top to bottom to be aligned as they close
+            self._ordered = False
+
+    def _close_row(self):
+        row = sorted(self._row, key=lambda a: a.bounds.x, reverse=(self.direction == "RTL"))
+        prev = self._prev_row
+        if prev is not None and self.detector._check_vertical_alignment(prev, row):
+            if self._zone is None:
+                self._zone = [min(a.index for a in prev), max(a.index for a in prev)]
+            self._zone[0] = min(self._zone[0], min(a.index for a in row))
+            self._zone[1] = max(self._zone[1], max(a.index for a in row))
+        elif self._zone is not None:
+            logger.info(f"Structure Detected (Table): Atoms {self._zone[0]}-{self._zone[1]}")
+            self._page_zones.append(StructuralRange(self._zone[0], self._zone[1], "Table"))
+            self._zone = None
+        self._prev_row = row
+
+    def _close_page(self) -> List[StructuralRange]:
+        if self._page is None:
+            return []
+        if self._ordered:
+            if self._row:
+                self._close_row()
+            if self._zone is not None:
+                logger.info(f"Structure Detected (Table): Atoms {self._zone[0]}-{self._zone[1]}")
+                self._page_zones.append(StructuralRange(self._zone[0], self._zone[1], "Table"))
+            page_zones = self._page_zones
+        else:
+            logger.debug(f"Incremental discovery: rows out of order on Page {self._page}; re-running page.")
+            page_zones = self.detector.detect_table_zones(self._page_atoms, self.direction)
+
+        self._zones.extend(page_zones)
+        self._closed_pages.add(self._page)
+        self._page = None
+        self._reset_page()
+        return page_zones
+
+
 @dataclass
 class GeometricChunk:
     content: str
@@ -165,129 +619,606 @@ class GeometricChunk:
     token_count: int
     discriminator: str
 
+@dataclass
+class ChunkPlan:
+    """
+    Compact, replayable record of the cut points chosen for a manifest.
+    Span i covers atom positions [starts[i], ends[i]) and carries discriminators[i].
+    """
+    target_tokens: int
+    hard_max_tokens: int
+    overlap_tokens: int
+    starts: array
+    ends: array
+    discriminators: List[str]
+    manifest_fingerprint: Optional[str] = None
+    strategy: str = "greedy"
+    atom_count: int = 0
+    token_total: int = 0
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def spans(self) -> Iterator[Tuple[int, int, str]]:
+        return zip(self.starts, self.ends, self.discriminators)
+
+    def cache_key(self) -> Tuple[Optional[str], int, int, int, str]:
+        return (self.manifest_fingerprint, self.target_tokens, self.hard_max_tokens, self.overlap_tokens, self.strategy)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form, suitable for storing next to the manifest."""
+        return {
+            "manifest_fingerprint": self.manifest_fingerprint,
+            "target_tokens": self.target_tokens,
+            "hard_max_tokens": self.hard_max_tokens,
+            "overlap_tokens": self.overlap_tokens,
+            "strategy": self.strategy,
+            "atom_count": self.atom_count,
+            "token_total": self.token_total,
+            "starts": list(self.starts),
+            "ends": list(self.ends),
+            "discriminators": list(self.discriminators),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChunkPlan":
+        starts = array("q", data["starts"])
+        ends = array("q", data["ends"])
+        discriminators = list(data["discriminators"])
+        if not (len(starts) == len(ends) == len(discriminators)):
+            raise ValueError("ChunkPlan spans, ends and discriminators must have equal length.")
+        return cls(
+            target_tokens=data["target_tokens"],
+            hard_max_tokens=data["hard_max_tokens"],
+            overlap_tokens=data["overlap_tokens"],
+            starts=starts,
+            ends=ends,
+            discriminators=discriminators,
+            manifest_fingerprint=data.get("manifest_fingerprint"),
+            strategy=data.get("strategy", "greedy"),
+            atom_count=data.get("atom_count", 0),
+            token_total=data.get("token_total", 0),
+        )
+
+
+class ChunkPlanCache:
+    """
+    Thread-safe LRU memo of ChunkPlans keyed by manifest key (fingerprint) and chunking parameters.
+    Can be shared by any number of IntegrityPipes.
+    """
+    def __init__(self, max_entries: int = 1024):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._plans: "OrderedDict[Tuple, ChunkPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def get(self, key: Tuple) -> Optional[ChunkPlan]:
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+            return plan
+
+    def put(self, plan: ChunkPlan) -> None:
+        key = plan.cache_key()
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+
+class ChunkIndex:
+    """
+    Span-to-chunk lookup index for "Link to Source" citations.
+    Populated by IntegrityPipe.generate_chunks(index=...); chunk ids are positions in the chunk stream.
+    Atom queries use the atom index fields carried by GeometricChunk.start_index/end_index.
+    """
+    def __init__(self):
+        self._starts = array("q")
+        self._ends = array("q")
+        self._max_ends = array("q")  # Running maximum of ends, monotone even when chunks overlap
+        self._pages: Dict[int, List[int]] = {}
+        # Per page: (atom index, bounds) of every atom registered once, regardless of chunk overlap
+        self._atom_boxes: Dict[int, List[Tuple[int, BoundingBox]]] = {}
+        self._seen_atoms = set()
+        # Per page: atom boxes sorted by top edge with a running maximum of bottom edges, built on first query
+        self._region_order: Dict[int, Tuple[array, array, List[Tuple[int, BoundingBox]]]] = {}
+        self._ordered = True
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def add(self, chunk: GeometricChunk, atoms: Sequence[GeometricAtom]) -> int:
+        """Registers a chunk and the atoms it was built from; returns its chunk id."""
+        chunk_id = len(self._starts)
+        if self._starts and chunk.start_index < self._starts[-1]:
+            self._ordered = False
+        self._starts.append(chunk.start_index)
+        self._ends.append(chunk.end_index)
+        self._max_ends.append(max(chunk.end_index, self._max_ends[-1]) if self._max_ends else chunk.end_index)
+
+        pages = []
+        for a in atoms:
+            if a.page not in pages:
+                pages.append(a.page)
+                self._pages.setdefault(a.page, []).append(chunk_id)
+            # Overlapping chunks share atoms; each atom box is indexed once and mapped back through the spans
+            if a.index not in self._seen_atoms:
+                self._seen_atoms.add(a.index)
+                self._atom_boxes.setdefault(a.page, []).append((a.index, a.bounds))
+                self._region_order.pop(a.page, None)
+        return chunk_id
+
+    def chunks_for_atom(self, atom_index: int) -> List[int]:
+        """Chunk ids whose atom span covers the given atom index, in O(log n + k)."""
+        if not self._ordered:
+            return [c for c in range(len(self._starts)) if self._starts[c] <= atom_index <= self._ends[c]]
+        hi = bisect_right(self._starts, atom_index)
+        lo = bisect_left(self._max_ends, atom_index, 0, hi)
+        return [c for c in range(lo, hi) if self._ends[c] >= atom_index]
+
+    def chunks_for_page(self, page: int) -> List[int]:
+        """Chunk ids containing at least one atom on the given page."""
+        return list(self._pages.get(page, ()))
+
+    def chunks_for_region(self, page: int, region: BoundingBox) -> List[int]:
+        """
+        Chunk ids containing an atom on the given page whose own bounds intersect the region.
+        Atom boxes are bisected by top edge, so the cost is O(log n + k) in the atoms on the page
+        that overlap the region vertically.
+        """
+        if page not in self._atom_boxes:
+            return []
+        order = self._region_order.get(page)
+        if order is None:
+            order = self._build_region_order(page)
+        tops, max_bottoms, entries = order
+        rx1 = region.x + region.width
+        ry1 = region.y + region.height
+        hi = bisect_right(tops, ry1)
+        lo = bisect_left(max_bottoms, region.y, 0, hi)
+        chunk_ids = set()
+        for atom_index, b in entries[lo:hi]:
+            if b.x <= rx1 and region.x <= b.x + b.width and region.y <= b.y + b.height:
+                chunk_ids.update(self.chunks_for_atom(atom_index))
+        return sorted(chunk_ids)
+
+    def _build_region_order(self, page: int) -> Tuple[array, array, List[Tuple[int, BoundingBox]]]:
+        entries = sorted(self._atom_boxes.get(page, ()), key=lambda entry: entry[1].y)
+        tops = array("d", (b.y for _, b in entries))
+        max_bottoms = array("d", accumulate((b.y + b.height for _, b in entries), max))
+        order = (tops, max_bottoms, entries)
+        self._region_order[page] = order
+        return order
+
+
+def _token_boundary(prefix: Sequence[int], base: int, total_atoms: int, start: int, limit: int) -> int:
+    """First local index past start whose running token sum exceeds limit (at least start + 1)."""
+    j = bisect_right(prefix, prefix[base + start] + limit, base + start + 1, base + total_atoms + 1)
+    i = j - 1 - base
+    if i == start and start < total_atoms:
+        return start + 1
+    return i
+
+
+def _token_overlap(prefix: Sequence[int], base: int, end: int, overlap_limit: int) -> int:
+    """Finds the local index to start the next chunk for overlap."""
+    return bisect_left(prefix, prefix[base + end] - overlap_limit, base, base + end) - base
+
+
+def _render_span(cursor: int, end: int, fields: Tuple[str, int, int, int],
+                 structures_at: Callable[[int], Sequence[StructuralRange]], token_count: int, reason: str) -> GeometricChunk:
+    """
+    Renders the chunk for local span [cursor, end): page and structure markers, then the atom text.
+    fields is (joined text, page, first atom index, last atom index); structures_at maps a local
+    position to the structures covering it. Shared by IntegrityPipe and BatchIntegrityPipe.
+    """
+    text, page_val, start_idx, end_idx = fields
+    s_types = []
+    for atomic_idx in (cursor, end - 1):
+        for s in structures_at(atomic_idx):
+            if s.type not in s_types:
+                s_types.append(s.type)
+
+    markers = [f"[Page {page_val}]"] + [f"[{t}]" for t in s_types]
+    return GeometricChunk(" ".join(markers) + " " + text, start_idx, end_idx, page_val, token_count, reason)
+
+
+def _plan_greedy_spans(prefix: Sequence[int], base: int, total_atoms: int,
+                       collision_at: Callable[[int], Optional[StructuralRange]],
+                       target_tokens: int, hard_max_tokens: int, overlap_tokens: int) -> Tuple[array, array, List[str]]:
+    """
+    Greedy GIP cut planning for one document occupying prefix rows [base, base + total_atoms].
+    prefix holds running token sums (prefix[k] = tokens before row k), so every token scan
+    is a C-level bisect. Spans are returned in document-local positions.
+    """
+    starts = array("q")
+    ends = array("q")
+    discriminators: List[str] = []
+
+    soft_break_threshold = 0.5 
+    cursor = 0
+
+    while cursor < total_atoms:
+        # 1. Proposed cut point based on Target
+        end = _token_boundary(prefix, base, total_atoms, cursor, target_tokens)
+        reason = "TargetReached"
+        
+        # 2. GIP 2.3 Optimized Structural Collision Check (O(1))
+        # Peek at the boundary atom's structural associations
+        collision = collision_at(end)
+        
+        if collision:
+            # GIP 2.0: Soft-Break & Target Logic
+            structure_size = collision.end - collision.start
+            proximity_to_end = (end - collision.start) / max(1, structure_size)
+            
+            if structure_size > hard_max_tokens or proximity_to_end > soft_break_threshold:
+                if structure_size > hard_max_tokens:
+                    logger.info(f"Soft-Break for oversized {collision.type}")
+                    reason = f"SoftBreak-{collision.type}"
+                else:
+                    end = collision.end + 1
+                    reason = f"Preserved-{collision.type}"
+            else:
+                end = collision.start
+                reason = "Backpressure-Recede"
+                
+                if end <= cursor:
+                    end = _token_boundary(prefix, base, total_atoms, cursor, target_tokens)
+                    reason = f"ForcedSplit-{collision.type}"
+        
+        end = min(end, total_atoms)
+        if end <= cursor:
+            break
+            
+        # Density Fix: Merging trailing fragments
+        # Use a percentage of target tokens rather than a hard constant (10)
+        density_threshold = max(2, int(target_tokens * 0.2)) 
+        remaining = total_atoms - end
+        if 0 < remaining < density_threshold: 
+            end = total_atoms
+
+        # 3. Record the span; content is materialized by _render_plan
+        starts.append(cursor)
+        ends.append(end)
+        discriminators.append(reason)
+        
+        # GIP 2.0: Geometric Overlap
+        # Move cursor back by overlap amount, but ensure progress
+        if overlap_tokens > 0:
+            new_cursor = _token_overlap(prefix, base, end, overlap_tokens)
+            cursor = max(cursor + 1, new_cursor) # Ensure at least 1 atom progress
+        else:
+            cursor = end
+
+    return starts, ends, discriminators
+
+
 class IntegrityPipe:
     """Enterprise-grade Geometric Integrity Pipeline."""
-    def __init__(self, manifest: GeometricManifest, overlap_tokens: int = 0):
+    def __init__(self, manifest: GeometricManifest, overlap_tokens: int = 0, plan_cache: Optional[ChunkPlanCache] = None,
+                 manifest_key: Optional[str] = None):
+        """
+        :param manifest_key: Caller-supplied plan cache key (e.g. a document id plus version);
+                             defaults to manifest.fingerprint(). The caller keeps it current.
+        """
         if not manifest:
             raise ValueError("IntegrityPipe requires a valid GeometricManifest.")
         self.manifest = manifest
         self.overlap_tokens = max(0, overlap_tokens)
+        self.plan_cache = plan_cache
+        self.manifest_key = manifest_key
 
-    def generate_chunks(self, target_tokens: int, hard_max_tokens: Optional[int] = None) -> Generator[GeometricChunk, None, None]:
+    def generate_chunks(self, target_tokens: int, hard_max_tokens: Optional[int] = None, index: Optional[ChunkIndex] = None,
+                        strategy: str = "greedy") -> Generator[GeometricChunk, None, None]:
         """
         Generates text chunks using optimized O(1) structural verification.
+        :param strategy: "greedy" (cut at each target) or "packed" (fewest chunks within hard_max_tokens)
+        When a plan_cache is attached, cut points are memoized per manifest and parameters.
+        When an index is given, each emitted chunk is registered in it for citation lookups.
+        """
+        if self.plan_cache is not None:
+            plan = self.plan_chunks(target_tokens, hard_max_tokens, strategy)
+        else:
+            plan = self._build_plan(target_tokens, hard_max_tokens, None, strategy)
+        yield from self._render_plan(plan, index)
+
+    def plan_chunks(self, target_tokens: int, hard_max_tokens: Optional[int] = None, strategy: str = "greedy") -> ChunkPlan:
+        """
+        Computes (or fetches from the plan cache) the cut points for this manifest.
+        The returned plan is stamped with the manifest key and can be replayed later.
         """
+        fingerprint = self.manifest_key if self.manifest_key is not None else self.manifest.fingerprint()
+        if self.plan_cache is not None:
+            hard_max = self._resolve_hard_max(target_tokens, hard_max_tokens)
+            cached = self.plan_cache.get((fingerprint, target_tokens, hard_max, self.overlap_tokens, strategy))
+            if cached is not None:
+                logger.debug(f"Chunk plan cache hit for manifest {fingerprint[:12]}")
+                return cached
+
+        plan = self._build_plan(target_tokens, hard_max_tokens, fingerprint, strategy)
+        if self.plan_cache is not None:
+            self.plan_cache.put(plan)
+        return plan
+
+    def replay_plan(self, plan: ChunkPlan, index: Optional[ChunkIndex] = None) -> Generator[GeometricChunk, None, None]:
+        """
+        Materializes chunks from a previously computed plan without re-running boundary
+        or collision logic. The plan must carry this pipe's manifest_key, or the manifest's
+        current fingerprint when no key is set, and match its atom count and token total.
+        """
+        expected = self.manifest_key if self.manifest_key is not None else self.manifest.fingerprint()
+        if plan.manifest_fingerprint != expected:
+            raise ValueError("ChunkPlan was computed for a different manifest (or one that has since changed).")
+        tokens = self.manifest.token_counts()
+        if plan.atom_count != len(tokens) or plan.token_total != sum(tokens):
+            raise ValueError("ChunkPlan was computed for a different manifest.")
+        yield from self._render_plan(plan, index)
+
+    @staticmethod
+    def _resolve_hard_max(target_tokens: int, hard_max_tokens: Optional[int]) -> int:
         if target_tokens <= 0:
             raise ValueError("target_tokens must be positive")
 
         if hard_max_tokens is None:
             hard_max_tokens = int(target_tokens * 1.2) # Conservative preference
+        return hard_max_tokens
+
+    def _build_plan(self, target_tokens: int, hard_max_tokens: Optional[int], fingerprint: Optional[str], strategy: str = "greedy") -> ChunkPlan:
+        hard_max_tokens = self._resolve_hard_max(target_tokens, hard_max_tokens)
+        if strategy == "packed":
+            return self._build_packed_plan(target_tokens, hard_max_tokens, fingerprint)
+        if strategy != "greedy":
+            raise ValueError(f"Unknown chunking strategy: {strategy}")
+
+        tokens = self.manifest.token_counts()
+        prefix = array("q", accumulate(tokens, initial=0))
+
+        def collision_at(atom_index: int) -> Optional[StructuralRange]:
+            structures = self.manifest.get_structures_at(atom_index)
+            return structures[0] if structures else None
+
+        starts, ends, discriminators = _plan_greedy_spans(
+            prefix, 0, len(tokens), collision_at, target_tokens, hard_max_tokens, self.overlap_tokens)
+
+        return ChunkPlan(target_tokens, hard_max_tokens, self.overlap_tokens, starts, ends, discriminators, fingerprint, strategy,
+                         len(tokens), prefix[-1])
+
+    def _build_packed_plan(self, target_tokens: int, hard_max_tokens: int, fingerprint: Optional[str]) -> ChunkPlan:
+        """
+        Plans the fewest chunks that fit hard_max_tokens without cutting inside any structure
+        that fits on its own, then balances cut positions across that minimal chunk count.
+        Forward/backward greedy bound each cut, so planning is O(n + k log n).
+        """
+        if self.overlap_tokens > 0:
+            raise ValueError("The packed strategy does not support overlap_tokens.")
+
+        tokens = self.manifest.token_counts()
+        total_atoms = len(tokens)
+        prefix = array("q", accumulate(tokens, initial=0))
 
-        soft_break_threshold = 0.5 
+        # Cut c splits atoms c-1 and c; it is forbidden inside a preservable structure.
+        blocked: List[Tuple[int, int]] = []
+        oversized: List[StructuralRange] = []
+        for s in self.manifest.structures:
+            start = max(0, min(s.start, total_atoms - 1))
+            end = max(0, min(s.end, total_atoms - 1))
+            if end <= start:
+                continue
+            if prefix[end + 1] - prefix[start] <= hard_max_tokens:
+                blocked.append((start + 1, end))
+            else:
+                oversized.append(s)
+
+        allowed = array("q")
         cursor = 0
-        total_atoms = len(self.manifest.atoms)
-        chunk_idx = 0
+        for lo, hi in sorted(blocked):
+            if lo > cursor:
+                allowed.extend(range(cursor, lo))
+            cursor = max(cursor, hi + 1)
+        allowed.extend(range(cursor, total_atoms + 1))
 
-        while cursor < total_atoms:
-            # 1. Proposed cut point based on Target
-            end = self._find_token_boundary(cursor, target_tokens)
-            reason = "TargetReached"
-            
-            # 2. GIP 2.3 Optimized Structural Collision Check (O(1))
-            # Peek at the boundary atom's structural associations
-            structures = self.manifest.get_structures_at(end)
-            collision = structures[0] if structures else None
-            
-            if collision:
-                # GIP 2.0: Soft-Break & Target Logic
-                structure_size = collision.end - collision.start
-                proximity_to_end = (end - collision.start) / max(1, structure_size)
-                
-                if structure_size > hard_max_tokens or proximity_to_end > soft_break_threshold:
-                    if structure_size > hard_max_tokens:
-                        logger.info(f"Soft-Break for oversized {collision.type}")
-                        reason = f"SoftBreak-{collision.type}"
-                    else:
-                        end = collision.end + 1
-                        reason = f"Preserved-{collision.type}"
-                else:
-                    end = collision.start
-                    reason = "Backpressure-Recede"
-                    
-                    if end <= cursor:
-                        end = self._find_token_boundary(cursor, target_tokens)
-                        reason = f"ForcedSplit-{collision.type}"
-            
-            end = min(end, total_atoms)
-            
-            # 4. Emit Chunk
-            chunk_atoms = self.manifest.atoms[cursor:end]
-            if not chunk_atoms:
+        def reach_forward(p: int) -> int:
+            # Furthest allowed cut that keeps [p, c) within budget (or the next cut, if none does)
+            limit = bisect_right(prefix, prefix[p] + hard_max_tokens) - 1
+            c = allowed[bisect_right(allowed, limit) - 1]
+            return c if c > p else allowed[bisect_right(allowed, p)]
+
+        def reach_backward(c: int) -> int:
+            # Earliest allowed start that keeps [p, c) within budget (or the previous cut, if none does)
+            p = allowed[bisect_left(allowed, bisect_left(prefix, prefix[c] - hard_max_tokens))]
+            return p if p < c else allowed[bisect_left(allowed, c) - 1]
+
+        forward = [0]
+        while forward[-1] < total_atoms:
+            forward.append(reach_forward(forward[-1]))
+        backward = [total_atoms]
+        while backward[-1] > 0:
+            backward.append(reach_backward(backward[-1]))
+        backward.reverse()
+
+        cuts = forward
+        if len(backward) == len(forward) > 2:
+            # Any cut between the backward and forward greedy bounds keeps the minimal count;
+            # pick the allowed one closest to an even share of the remaining tokens.
+            cuts = [0]
+            chunk_count = len(forward) - 1
+            for i in range(1, chunk_count):
+                p = cuts[-1]
+                ideal = prefix[p] + (prefix[total_atoms] - prefix[p]) / (chunk_count - i + 1)
+                lo = allowed[bisect_left(allowed, max(backward[i], p + 1))]
+                hi = reach_forward(p)
+                k = bisect_left(allowed, bisect_left(prefix, ideal))
+                candidates = [allowed[j] for j in (k - 1, k) if 0 <= j < len(allowed)]
+                c = min(candidates, key=lambda x: abs(prefix[x] - ideal))
+                cuts.append(min(max(c, lo), hi))
+            cuts.append(total_atoms)
+
+        starts = array("q", cuts[:-1])
+        ends = array("q", cuts[1:])
+        discriminators = []
+        for end in ends:
+            reason = "Packed"
+            for s in oversized:
+                if s.start < end <= s.end:
+                    logger.info(f"Soft-Break for oversized {s.type}")
+                    reason = f"SoftBreak-{s.type}"
+                    break
+            discriminators.append(reason)
+
+        return ChunkPlan(target_tokens, hard_max_tokens, self.overlap_tokens, starts, ends, discriminators, fingerprint, "packed",
+                         total_atoms, prefix[-1])
+
+    def _render_plan(self, plan: ChunkPlan, index: Optional[ChunkIndex] = None) -> Generator[GeometricChunk, None, None]:
+        prefix_sums = array("q", accumulate(self.manifest.token_counts(), initial=0))
+        for chunk_idx, (cursor, end, reason) in enumerate(plan.spans()):
+            # 4. Emit Chunk (rendered from the manifest columns)
+            if end <= cursor:
                 break
-                
-            # Density Fix: Merging trailing fragments
-            # Use a percentage of target tokens rather than a hard constant (10)
-            density_threshold = max(2, int(target_tokens * 0.2)) 
-            remaining = total_atoms - end
-            if 0 < remaining < density_threshold: 
-                end = total_atoms
-                chunk_atoms = self.manifest.atoms[cursor:end]
-
-            # Semantic Anchoring: Enhanced Contextual Ancestry
-            page_val = chunk_atoms[0].page
-            
-            # Identify structures involving this chunk (O(1) lookup)
-            s_types = []
-            for atomic_idx in [cursor, end - 1]:
-                at_structures = self.manifest.get_structures_at(atomic_idx)
-                for s in at_structures:
-                    if s.type not in s_types:
-                        s_types.append(s.type)
-            
-            markers = [f"[Page {page_val}]"]
-            for t in s_types:
-                markers.append(f"[{t}]")
-            
-            prefix = " ".join(markers) + " " if markers else ""
-            content = prefix + " ".join(atom.text for atom in chunk_atoms)
-            
-            token_count = sum(a.token_count for a in chunk_atoms)
-            start_idx = chunk_atoms[0].index
-            end_idx = chunk_atoms[-1].index
+            token_count = prefix_sums[end] - prefix_sums[cursor]
+            # Structures involving this chunk come from the manifest's O(1) index map
+            chunk = _render_span(cursor, end, self.manifest._span_fields(cursor, end), self.manifest.get_structures_at,
+                                 token_count, reason)
 
             logger.info(f"Aegis Chunk {chunk_idx}: {token_count} tokens ({reason})")
-            chunk_idx += 1
-            yield GeometricChunk(content, start_idx, end_idx, page_val, token_count, reason)
-            
-            # GIP 2.0: Geometric Overlap
-            # Move cursor back by overlap amount, but ensure progress
-            if self.overlap_tokens > 0:
-                new_cursor = self._find_token_overlap(end, self.overlap_tokens)
-                cursor = max(cursor + 1, new_cursor) # Ensure at least 1 atom progress
-            else:
-                cursor = end
-
-    def _find_token_overlap(self, end: int, overlap_limit: int) -> int:
-        """Finds the index to start the next chunk for overlap."""
-        current_tokens = 0
-        i = end - 1
-        while i >= 0:
-            current_tokens += self.manifest.atoms[i].token_count
-            if current_tokens > overlap_limit:
-                return i + 1
-            i -= 1
-        return 0
-
-    def _find_token_boundary(self, start: int, limit: int) -> int:
-        current_tokens = 0
-        i = start
-        while i < len(self.manifest.atoms):
-            current_tokens += self.manifest.atoms[i].token_count
-            if current_tokens > limit:
-                break
-            i += 1
-        
-        if i == start and start < len(self.manifest.atoms):
-            return start + 1
-            
-        return i
+            if index is not None:
+                index.add(chunk, self.manifest.atoms[cursor:end])
+            yield chunk
+
+
+@dataclass
+class AtomTable:
+    """
+    Columnar atoms for many documents in one table. Document d owns rows
+    [doc_offsets[d], doc_offsets[d + 1]); its structures use document-local positions.
+    """
+    texts: List[str]
+    token_counts: array
+    pages: array
+    indices: array
+    doc_offsets: array
+    structures: List[List[StructuralRange]]
+
+    def __len__(self) -> int:
+        return len(self.doc_offsets) - 1
+
+    @classmethod
+    def from_manifests(cls, manifests: Iterable[GeometricManifest]) -> "AtomTable":
+        texts: List[str] = []
+        token_counts, pages, indices = array("q"), array("q"), array("q")
+        doc_offsets = array("q", [0])
+        structures = []
+        for m in manifests:
+            atoms = m.atoms
+            texts.extend(a.text for a in atoms)
+            token_counts.extend(a.token_count for a in atoms)
+            pages.extend(a.page for a in atoms)
+            indices.extend(a.index for a in atoms)
+            doc_offsets.append(len(texts))
+            structures.append(list(m.structures))
+        return cls(texts, token_counts, pages, indices, doc_offsets, structures)
+
+
+class BatchIntegrityPipe:
+    """
+    Chunks many small documents in one call. Token scans for the whole batch run over
+    a single prefix-sum array, and no per-document manifest or pipe is constructed.
+    Produces the same plans and chunks as IntegrityPipe's greedy strategy per document.
+    """
+    def __init__(self, overlap_tokens: int = 0):
+        self.overlap_tokens = max(0, overlap_tokens)
+
+    def plan_chunks(self, table: AtomTable, target_tokens: int, hard_max_tokens: Optional[int] = None) -> List[ChunkPlan]:
+        """One ChunkPlan per document, with spans in document-local positions."""
+        return self._plan_documents(table, target_tokens, hard_max_tokens)[1]
+
+    def generate_chunks(self, table: AtomTable, target_tokens: int, hard_max_tokens: Optional[int] = None) -> Generator[Tuple[int, GeometricChunk], None, None]:
+        """Yields (document number, chunk) pairs in document order."""
+        prefix, plans, bounds = self._plan_documents(table, target_tokens, hard_max_tokens)
+        texts, pages, indices = table.texts, table.pages, table.indices
+        for doc, plan in enumerate(plans):
+            base = table.doc_offsets[doc]
+            doc_bounds = bounds[doc]
+
+            def structures_at(atom_index: int) -> List[StructuralRange]:
+                return [s for lo, hi, s in doc_bounds if lo <= atom_index <= hi]
+
+            for cursor, end, reason in plan.spans():
+                lo, hi = base + cursor, base + end
+                fields = (" ".join(texts[lo:hi]), pages[lo], indices[lo], indices[hi - 1])
+                yield doc, _render_span(cursor, end, fields, structures_at, prefix[hi] - prefix[lo], reason)
+
+    def _plan_documents(self, table: AtomTable, target_tokens: int, hard_max_tokens: Optional[int]) -> Tuple[array, List[ChunkPlan], List[List[Tuple[int, int, StructuralRange]]]]:
+        hard_max_tokens = IntegrityPipe._resolve_hard_max(target_tokens, hard_max_tokens)
+        prefix = array("q", accumulate(table.token_counts, initial=0))
+        offsets = table.doc_offsets
+        if len(prefix) != offsets[-1] + 1 or len(table.structures) != len(table):
+            raise ValueError("AtomTable doc_offsets do not match its columns.")
+
+        plans = []
+        bounds = []
+        for doc in range(len(table)):
+            base = offsets[doc]
+            total_atoms = offsets[doc + 1] - base
+            # Same clamping and precedence as GeometricManifest's index map
+            doc_bounds = [(max(0, min(s.start, total_atoms - 1)), max(0, min(s.end, total_atoms - 1)), s) for s in table.structures[doc]]
+            bounds.append(doc_bounds)
+
+            def collision_at(atom_index: int) -> Optional[StructuralRange]:
+                for lo, hi, s in doc_bounds:
+                    if lo <= atom_index <= hi:
+                        return s
+                return None
+
+            starts, ends, discriminators = _plan_greedy_spans(
+                prefix, base, total_atoms, collision_at, target_tokens, hard_max_tokens, self.overlap_tokens)
+            plans.append(ChunkPlan(target_tokens, hard_max_tokens, self.overlap_tokens, starts, ends, discriminators,
+                                   atom_count=total_atoms, token_total=prefix[base + total_atoms] - prefix[base]))
+
+        logger.info(f"Aegis Batch: planned {sum(len(p) for p in plans)} chunks across {len(plans)} documents.")
+        return prefix, plans, bounds
+
+
+class ManifestChunkingPool:
+    """
+    Serves many concurrent chunk requests against one resident FrozenManifest from a thread pool.
+    Each request gets its own lightweight IntegrityPipe; the manifest is frozen once and never copied.
+    """
+    def __init__(self, manifest: GeometricManifest, max_workers: Optional[int] = None, plan_cache: Optional[ChunkPlanCache] = None):
+        if not manifest:
+            raise ValueError("ManifestChunkingPool requires a valid GeometricManifest.")
+        self.manifest = FrozenManifest.freeze(manifest)
+        self.plan_cache = plan_cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aegis-chunk")
+
+    def submit(self, target_tokens: int, hard_max_tokens: Optional[int] = None, overlap_tokens: int = 0) -> "Future[List[GeometricChunk]]":
+        return self._executor.submit(self._chunk, target_tokens, hard_max_tokens, overlap_tokens)
+
+    def map(self, target_tokens: Iterable[int], hard_max_tokens: Optional[int] = None, overlap_tokens: int = 0) -> Iterator[List[GeometricChunk]]:
+        """Chunks the manifest once per target size, yielding results in request order."""
+        futures = [self.submit(t, hard_max_tokens, overlap_tokens) for t in target_tokens]
+        for future in futures:
+            yield future.result()
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "ManifestChunkingPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+    def _chunk(self, target_tokens: int, hard_max_tokens: Optional[int], overlap_tokens: int) -> List[GeometricChunk]:
+        pipe = IntegrityPipe(self.manifest, overlap_tokens=overlap_tokens, plan_cache=self.plan_cache)
+        return list(pipe.generate_chunks(target_tokens, hard_max_tokens))
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .aegis_integrity import GeometricChunk
+
+logger = logging.getLogger(__name__)
+
+# An async callable taking the batch texts and returning one vector per text.
+Embedder = Callable[[List[str]], Awaitable[Sequence[Sequence[float]]]]
+
+
+@dataclass
+class EmbeddingBatch:
+    chunks: List[GeometricChunk]
+    token_count: int
+    vectors: Optional[List[Sequence[float]]] = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+
+
+class _BatchPacker:
+    """
+    First-fit packing over a bounded lookahead window of the chunk stream. The window is
+    never smaller than max_batch_items, so a stream of small chunks still fills whole batches.
+    """
+    def __init__(self, max_batch_tokens: int, max_batch_items: int, lookahead: int):
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_items = max_batch_items
+        self.lookahead = max(lookahead, max_batch_items)
+        self._pending: List[GeometricChunk] = []
+
+    def push(self, chunk: GeometricChunk) -> List[List[GeometricChunk]]:
+        self._pending.append(chunk)
+        ready = []
+        while len(self._pending) >= self.lookahead:
+            ready.append(self._take_batch())
+        return ready
+
+    def flush(self) -> List[List[GeometricChunk]]:
+        ready = []
+        while self._pending:
+            ready.append(self._take_batch())
+        return ready
+
+    def _take_batch(self) -> List[GeometricChunk]:
+        # The oldest chunk always leads, so no chunk waits longer than one window.
+        batch = [self._pending[0]]
+        tokens = batch[0].token_count
+        remaining = []
+        for chunk in self._pending[1:]:
+            if len(batch) < self.max_batch_items and tokens + chunk.token_count <= self.max_batch_tokens:
+                batch.append(chunk)
+                tokens += chunk.token_count
+            else:
+                remaining.append(chunk)
+        self._pending = remaining
+        return batch
+
+
+class EmbeddingBatchScheduler:
+    """
+    Groups a chunk stream into embedding requests that fill a token and item budget,
+    keeps up to max_in_flight requests running against an async embedder, and retries
+    failed batches with exponential backoff while the rest of the stream keeps flowing.
+    """
+    def __init__(self, embedder: Embedder, max_batch_tokens: int = 8192, max_batch_items: int = 96,
+                 max_in_flight: int = 4, max_retries: int = 3, retry_backoff: float = 0.5, lookahead: int = 64):
+        if max_batch_tokens <= 0 or max_batch_items <= 0:
+            raise ValueError("max_batch_tokens and max_batch_items must be positive")
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+        self.embedder = embedder
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_items = max_batch_items
+        self.max_in_flight = max_in_flight
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = max(0.0, retry_backoff)
+        self.lookahead = max(1, lookahead)
+
+    def form_batches(self, chunks: Iterable[GeometricChunk]) -> Iterator[List[GeometricChunk]]:
+        """
+        Synchronous batch formation, for callers that drive their own embedding client.
+        A chunk larger than max_batch_tokens is yielded alone in its own batch.
+        """
+        packer = self._packer()
+        for chunk in chunks:
+            yield from packer.push(chunk)
+        yield from packer.flush()
+
+    async def embed(self, chunks: Union[Iterable[GeometricChunk], AsyncIterable[GeometricChunk]]) -> AsyncIterator[EmbeddingBatch]:
+        """
+        Embeds the chunk stream, yielding EmbeddingBatch results in completion order.
+        Batches that still fail after max_retries are yielded with error set rather than raised.
+        A chunk larger than max_batch_tokens cannot succeed, so its batch is yielded at once with
+        a ValueError and attempts=0; the embedder is never called for it and the stream continues.
+        """
+        in_flight = set()
+        try:
+            async for batch in self._batches(chunks):
+                while len(in_flight) >= self.max_in_flight:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+                in_flight.add(asyncio.ensure_future(self._run_batch(batch)))
+                # Let the new request start before pulling more of a synchronous source
+                await asyncio.sleep(0)
+
+            while in_flight:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def _packer(self) -> _BatchPacker:
+        return _BatchPacker(self.max_batch_tokens, self.max_batch_items, self.lookahead)
+
+    async def _batches(self, chunks) -> AsyncIterator[List[GeometricChunk]]:
+        packer = self._packer()
+        if hasattr(chunks, "__aiter__"):
+            async for chunk in chunks:
+                for batch in packer.push(chunk):
+                    yield batch
+        else:
+            for chunk in chunks:
+                for batch in packer.push(chunk):
+                    yield batch
+        for batch in packer.flush():
+            yield batch
+
+    async def _run_batch(self, chunks: List[GeometricChunk]) -> EmbeddingBatch:
+        result = EmbeddingBatch(chunks, sum(c.token_count for c in chunks))
+        if result.token_count > self.max_batch_tokens:
+            result.error = ValueError(
+                f"Chunk of {result.token_count} tokens exceeds max_batch_tokens={self.max_batch_tokens}."
+            )
+            logger.warning(f"Embedding Scheduler: skipping oversized chunk: {result.error}")
+            return result
+
+        texts = [c.content for c in chunks]
+        while True:
+            result.attempts += 1
+            try:
+                vectors = list(await self.embedder(texts))
+                if len(vectors) != len(texts):
+                    raise ValueError(f"Embedder returned {len(vectors)} vectors for {len(texts)} texts.")
+                result.vectors = vectors
+                result.error = None
+                return result
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                result.error = exc
+                if result.attempts > self.max_retries:
+                    logger.warning(f"Embedding batch of {len(chunks)} chunks failed after {result.attempts} attempts: {exc}")
+                    return result
+                logger.info(f"Embedding batch failed (attempt {result.attempts}), retrying: {exc}")
+                await asyncio.sleep(self.retry_backoff * 2 ** (result.attempts - 1))
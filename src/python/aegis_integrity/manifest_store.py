@@ -0,0 +1,390 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .aegis_integrity import FrozenManifest, GeometricManifest, encode_manifest
+
+logger = logging.getLogger(__name__)
+
+# Segment record: header | doc id (padded to 8) | encoded manifest (padded to 8)
+_RECORD_MAGIC = b"AGR1"
+_RECORD_HEADER = struct.Struct("<4sIQ")
+# Index log entry: header | doc id
+_INDEX_ENTRY = struct.Struct("<IQQI")
+# Index snapshot: header | open-addressing table of (doc id hash, segment, record offset) slots
+_SNAPSHOT_MAGIC = b"AGS2"
+_SNAPSHOT_HEADER = struct.Struct("<4sQQQ")
+_SNAPSHOT_SLOT_FIELDS = 3
+
+
+def _pad8(length: int) -> int:
+    return (8 - length % 8) % 8
+
+
+def _id_hash(raw_id: bytes) -> int:
+    # Never zero: a zero hash marks an empty snapshot slot
+    return int.from_bytes(hashlib.blake2b(raw_id, digest_size=8).digest(), "little") or 1
+
+
+def _record_offset(raw_id: bytes, payload_offset: int) -> int:
+    return payload_offset - _pad8(len(raw_id)) - len(raw_id) - _RECORD_HEADER.size
+
+
+class ManifestStore:
+    """
+    Append-only, sharded store for corpus-scale manifest collections.
+    Manifests are packed into large segment files and located through a compact offset
+    index keyed by document id, with zero-copy mmap reads.
+
+    The index is an append-only log plus a hash-table snapshot written by the writer on close
+    (or write_snapshot()). Opening a store maps the snapshot and parses only the log tail
+    written after it, so start-up does not grow with corpus size. Lookups are O(1) and read
+    only mapped memory: a snapshot slot points at the segment record, whose stored doc id
+    confirms the match.
+
+    One writer process per store; any number of readonly=True readers. Readers never
+    modify files, and pick up newer entries through refresh() (called automatically on a miss).
+    """
+    SEGMENT_PREFIX = "segment-"
+    SEGMENT_SUFFIX = ".agm"
+    INDEX_NAME = "index.agi"
+    SNAPSHOT_NAME = "index.snap"
+
+    def __init__(self, root: str, max_segment_bytes: int = 256 * 1024 * 1024, durable: bool = False, readonly: bool = False):
+        if max_segment_bytes <= 0:
+            raise ValueError("max_segment_bytes must be positive")
+        self.root = root
+        self.max_segment_bytes = max_segment_bytes
+        self.durable = durable
+        self.readonly = readonly
+
+        # Index entries newer than the snapshot: doc_id -> (segment, offset, length, log offset)
+        self._delta: Dict[str, Tuple[int, int, int, int]] = {}
+        self._snapshot = None
+        self._snapshot_map = None
+        self._snapshot_count = 0
+        self._snapshot_capacity = 0
+        self._log_position = 0
+        self._count = 0
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._lock = threading.RLock()
+
+        self._index_path = os.path.join(root, self.INDEX_NAME)
+        if not readonly:
+            os.makedirs(root, exist_ok=True)
+        if readonly:
+            self._segment = None
+            self._segment_file = None
+            self._index_file = None
+        else:
+            segments = self._segment_numbers()
+            self._segment = segments[-1] if segments else 0
+            self._segment_file = open(self._segment_path(self._segment), "ab")
+            self._index_file = open(self._index_path, "ab")
+
+        self._open_snapshot()
+        self._read_log_tail()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, doc_id: str) -> bool:
+        return self._lookup(doc_id) is not None
+
+    def __enter__(self) -> "ManifestStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def doc_ids(self) -> List[str]:
+        return [doc_id for doc_id, _ in self._live_entries()]
+
+    def put(self, doc_id: str, manifest: GeometricManifest) -> None:
+        self.append_batch([(doc_id, manifest)])
+
+    def append_batch(self, items: Iterable[Tuple[str, GeometricManifest]]) -> int:
+        """
+        Appends a batch of (doc_id, manifest) pairs. Segment data is flushed before the
+        index entries that reference it, so a crash never indexes a partial record.
+        Re-writing a doc_id supersedes its earlier record. Returns the number written.
+        """
+        if self.readonly:
+            raise ValueError("ManifestStore was opened read-only.")
+        encoded = [(doc_id, doc_id.encode("utf-8"), encode_manifest(m)) for doc_id, m in items]
+        if not encoded:
+            return 0
+
+        with self._lock:
+            new_entries: List[Tuple[str, bytes, Tuple[int, int, int]]] = []
+            for doc_id, raw_id, payload in encoded:
+                position = self._segment_file.tell()
+                if position > 0 and position + len(payload) > self.max_segment_bytes:
+                    self._roll_segment()
+                    position = 0
+
+                header = _RECORD_HEADER.pack(_RECORD_MAGIC, len(raw_id), len(payload))
+                id_block = raw_id + b"\x00" * _pad8(len(raw_id))
+                self._segment_file.write(header + id_block)
+                self._segment_file.write(payload + b"\x00" * _pad8(len(payload)))
+                new_entries.append((doc_id, raw_id, (self._segment, position + len(header) + len(id_block), len(payload))))
+
+            self._sync(self._segment_file)
+            for doc_id, raw_id, (segment, offset, length) in new_entries:
+                record = _INDEX_ENTRY.pack(segment, offset, length, len(raw_id)) + raw_id
+                self._index_file.write(record)
+                self._add_entry(doc_id, (segment, offset, length, self._log_position))
+                self._log_position += len(record)
+            self._sync(self._index_file)
+
+        logger.info(f"Manifest Store: appended {len(new_entries)} manifests (segment {self._segment}).")
+        return len(new_entries)
+
+    def get(self, doc_id: str) -> FrozenManifest:
+        """O(1) lookup; the returned manifest reads directly from the memory-mapped segment."""
+        entry = self._lookup(doc_id)
+        if entry is None and self.readonly and self.refresh():
+            entry = self._lookup(doc_id)
+        if entry is None:
+            raise KeyError(doc_id)
+        segment, offset, length = entry
+        view = memoryview(self._map(segment, offset + length))
+        return FrozenManifest(view[offset:offset + length])
+
+    def refresh(self) -> int:
+        """Picks up index entries appended since the last read; returns how many were found."""
+        with self._lock:
+            return self._read_log_tail()
+
+    def scan(self) -> Iterator[Tuple[str, FrozenManifest]]:
+        """
+        Yields the live (doc_id, manifest) pairs in storage order, for bulk re-chunking.
+        Driven by the index, so torn bytes left in a segment by a crash are never read and
+        never hide records appended after them.
+        """
+        live = sorted(self._live_entries(), key=lambda item: item[1])
+        for doc_id, (segment, offset, length) in live:
+            view = memoryview(self._map(segment, offset + length))
+            yield doc_id, FrozenManifest(view[offset:offset + length])
+
+    def write_snapshot(self) -> None:
+        """Folds the index log into a new snapshot table (writer only, O(n))."""
+        if self.readonly:
+            raise ValueError("ManifestStore was opened read-only.")
+        with self._lock:
+            self._sync(self._index_file)
+            slots = [
+                (_id_hash(doc_id.encode("utf-8")), segment, _record_offset(doc_id.encode("utf-8"), offset))
+                for doc_id, (segment, offset, _) in self._live_entries()
+            ]
+            capacity = 8
+            while capacity < 2 * len(slots):
+                capacity *= 2
+            table = array("Q", bytes(8 * _SNAPSHOT_SLOT_FIELDS * capacity))
+            for id_hash, segment, record_offset in slots:
+                slot = id_hash & (capacity - 1)
+                while table[_SNAPSHOT_SLOT_FIELDS * slot]:
+                    slot = (slot + 1) & (capacity - 1)
+                table[_SNAPSHOT_SLOT_FIELDS * slot:_SNAPSHOT_SLOT_FIELDS * (slot + 1)] = array("Q", (id_hash, segment, record_offset))
+            if sys.byteorder != "little":
+                table.byteswap()
+
+            temp_path = os.path.join(self.root, self.SNAPSHOT_NAME + ".tmp")
+            with open(temp_path, "wb") as handle:
+                handle.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, self._log_position, len(slots), capacity))
+                handle.write(table.tobytes())
+                self._sync(handle)
+            # Unmap first: a mapped file cannot be replaced on Windows
+            self._close_snapshot()
+            os.replace(temp_path, os.path.join(self.root, self.SNAPSHOT_NAME))
+            self._delta.clear()
+            self._open_snapshot()
+        logger.info(f"Manifest Store: index snapshot written ({len(slots)} documents).")
+
+    def flush(self) -> None:
+        if self.readonly:
+            return
+        with self._lock:
+            self._sync(self._segment_file)
+            self._sync(self._index_file)
+
+    def close(self) -> None:
+        if not self.readonly and not self._index_file.closed and self._delta:
+            self.write_snapshot()
+        with self._lock:
+            if not self.readonly:
+                self._segment_file.close()
+                self._index_file.close()
+            self._close_snapshot()
+            for mapped in self._maps.values():
+                try:
+                    mapped.close()
+                except BufferError:
+                    # Manifests handed out still reference this map; it is released with them.
+                    pass
+            self._maps.clear()
+
+    def _sync(self, handle) -> None:
+        handle.flush()
+        if self.durable:
+            os.fsync(handle.fileno())
+
+    def _map(self, segment: int, required: int) -> mmap.mmap:
+        mapped = self._maps.get(segment)
+        if mapped is not None and len(mapped) >= required:
+            return mapped
+        with self._lock:
+            mapped = self._maps.get(segment)
+            if mapped is None or len(mapped) < required:
+                if segment == self._segment:
+                    self._segment_file.flush()
+                with open(self._segment_path(segment), "rb") as handle:
+                    mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                # Older, shorter maps stay alive for as long as earlier readers hold views on them.
+                self._maps[segment] = mapped
+            return mapped
+
+    def _roll_segment(self) -> None:
+        self._sync(self._segment_file)
+        self._segment_file.close()
+        self._segment += 1
+        self._segment_file = open(self._segment_path(self._segment), "ab")
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.root, f"{self.SEGMENT_PREFIX}{segment:06d}{self.SEGMENT_SUFFIX}")
+
+    def _segment_numbers(self) -> List[int]:
+        prefix, suffix = self.SEGMENT_PREFIX, self.SEGMENT_SUFFIX
+        numbers = []
+        for name in os.listdir(self.root):
+            if name.startswith(prefix) and name.endswith(suffix):
+                digits = name[len(prefix):-len(suffix)]
+                if digits.isdigit():
+                    numbers.append(int(digits))
+        return sorted(numbers)
+
+    def _add_entry(self, doc_id: str, entry: Tuple[int, int, int, int]) -> None:
+        if doc_id not in self._delta and self._snapshot_lookup(doc_id) is None:
+            self._count += 1
+        self._delta[doc_id] = entry
+
+    def _lookup(self, doc_id: str):
+        if not self.readonly:
+            # The writer swaps the snapshot in write_snapshot(); readers never do
+            with self._lock:
+                return self._lookup_unlocked(doc_id)
+        return self._lookup_unlocked(doc_id)
+
+    def _lookup_unlocked(self, doc_id: str):
+        entry = self._delta.get(doc_id)
+        if entry is not None:
+            return entry[:3]
+        return self._snapshot_lookup(doc_id)
+
+    def _live_entries(self) -> List[Tuple[str, Tuple[int, int, int]]]:
+        with self._lock:
+            live = []
+            for segment, record_offset in self._snapshot_records():
+                doc_id, offset, length = self._read_record(segment, record_offset)
+                if doc_id not in self._delta:
+                    live.append((doc_id, (segment, offset, length)))
+            live.extend((doc_id, entry[:3]) for doc_id, entry in self._delta.items())
+            return live
+
+    def _open_snapshot(self) -> None:
+        path = os.path.join(self.root, self.SNAPSHOT_NAME)
+        if not os.path.exists(path) or os.path.getsize(path) < _SNAPSHOT_HEADER.size:
+            return
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, log_position, count, capacity = _SNAPSHOT_HEADER.unpack_from(mapped, 0)
+        if magic != _SNAPSHOT_MAGIC:
+            mapped.close()
+            raise ValueError(f"{path} is not an Aegis index snapshot.")
+        end = _SNAPSHOT_HEADER.size + 8 * _SNAPSHOT_SLOT_FIELDS * capacity
+        self._snapshot_map = mapped
+        self._snapshot = memoryview(mapped)[_SNAPSHOT_HEADER.size:end].cast("Q")
+        self._snapshot_count = count
+        self._snapshot_capacity = capacity
+        self._log_position = log_position
+        self._count = count
+
+    def _close_snapshot(self) -> None:
+        if self._snapshot is not None:
+            self._snapshot.release()
+            self._snapshot_map.close()
+        self._snapshot = None
+        self._snapshot_map = None
+        self._snapshot_count = 0
+        self._snapshot_capacity = 0
+
+    def _snapshot_records(self) -> Iterator[Tuple[int, int]]:
+        table = self._snapshot
+        for slot in range(self._snapshot_capacity):
+            base = _SNAPSHOT_SLOT_FIELDS * slot
+            if table[base]:
+                yield table[base + 1], table[base + 2]
+
+    def _snapshot_lookup(self, doc_id: str):
+        """Probes the snapshot table; returns (segment, offset, length) or None."""
+        if not self._snapshot_count:
+            return None
+        raw_id = doc_id.encode("utf-8")
+        target = _id_hash(raw_id)
+        table, mask = self._snapshot, self._snapshot_capacity - 1
+        slot = target & mask
+        while True:
+            base = _SNAPSHOT_SLOT_FIELDS * slot
+            id_hash = table[base]
+            if not id_hash:
+                return None
+            if id_hash == target:
+                segment, record_offset = table[base + 1], table[base + 2]
+                # Compare against the doc id stored in the segment record, so hash collisions never alias
+                mapped = self._map(segment, record_offset + _RECORD_HEADER.size + len(raw_id))
+                _, id_length, length = _RECORD_HEADER.unpack_from(mapped, record_offset)
+                id_start = record_offset + _RECORD_HEADER.size
+                if id_length == len(raw_id) and mapped[id_start:id_start + id_length] == raw_id:
+                    return segment, id_start + id_length + _pad8(id_length), length
+            slot = (slot + 1) & mask
+
+    def _read_record(self, segment: int, record_offset: int) -> Tuple[str, int, int]:
+        mapped = self._map(segment, record_offset + _RECORD_HEADER.size)
+        _, id_length, length = _RECORD_HEADER.unpack_from(mapped, record_offset)
+        id_start = record_offset + _RECORD_HEADER.size
+        raw_id = mapped[id_start:id_start + id_length]
+        return raw_id.decode("utf-8"), id_start + id_length + _pad8(id_length), length
+
+    def _read_log_tail(self) -> int:
+        if not os.path.exists(self._index_path):
+            return 0
+        with open(self._index_path, "rb") as handle:
+            handle.seek(self._log_position)
+            data = handle.read()
+
+        position = 0
+        added = 0
+        while position + _INDEX_ENTRY.size <= len(data):
+            segment, offset, length, id_length = _INDEX_ENTRY.unpack_from(data, position)
+            id_end = position + _INDEX_ENTRY.size + id_length
+            if id_end > len(data):
+                break
+            doc_id = data[position + _INDEX_ENTRY.size:id_end].decode("utf-8")
+            self._add_entry(doc_id, (segment, offset, length, self._log_position + position))
+            position = id_end
+            added += 1
+        self._log_position += position
+
+        if position < len(data) and not self.readonly:
+            # Torn trailing entry from an interrupted write: only the writer repairs it, so that
+            # readers never cut off an entry the writer is still flushing.
+            logger.warning(f"Manifest Store: discarding {len(data) - position} bytes of incomplete index data.")
+            with open(self._index_path, "r+b") as handle:
+                handle.truncate(self._log_position)
+        return added
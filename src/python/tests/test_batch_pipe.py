@@ -0,0 +1,60 @@
+import sys
+import os
+import random
+import unittest
+
+# Setup path to internal source
+sys.path.insert(0, os.path.abspath('src/python'))
+from aegis_integrity.aegis_integrity import (
+    GeometricAtom, BoundingBox, GeometricManifest, IntegrityPipe, StructuralRange, AtomTable, BatchIntegrityPipe
+)
+
+def random_manifest(rng: random.Random, doc: int):
+    n = rng.randint(0, 90)
+    atoms = [
+        GeometricAtom(text=f"d{doc}w{i}", bounds=BoundingBox(0, 0, 5, 5), page=1 + i // 40, token_count=rng.randint(1, 4), index=i)
+        for i in range(n)
+    ]
+    structures = []
+    for _ in range(rng.randint(0, 3)):
+        start = rng.randrange(max(n, 1))
+        structures.append(StructuralRange(start, start + rng.randint(0, 40), rng.choice(["Table", "List"])))
+    return GeometricManifest(atoms, structures)
+
+class TestBatchIntegrityPipe(unittest.TestCase):
+    def test_batch_matches_per_document_pipes(self):
+        rng = random.Random(11)
+        manifests = [random_manifest(rng, d) for d in range(60)]
+        table = AtomTable.from_manifests(manifests)
+
+        for overlap in (0, 6):
+            batch = BatchIntegrityPipe(overlap_tokens=overlap)
+            actual = list(batch.generate_chunks(table, target_tokens=30, hard_max_tokens=45))
+            expected = [
+                (doc, chunk)
+                for doc, m in enumerate(manifests)
+                for chunk in IntegrityPipe(m, overlap_tokens=overlap).generate_chunks(30, 45)
+            ]
+            self.assertEqual(actual, expected)
+
+    def test_plans_respect_document_boundaries(self):
+        rng = random.Random(3)
+        manifests = [random_manifest(rng, d) for d in range(20)]
+        table = AtomTable.from_manifests(manifests)
+
+        plans = BatchIntegrityPipe().plan_chunks(table, target_tokens=25)
+
+        self.assertEqual(len(plans), len(manifests))
+        for plan, m in zip(plans, manifests):
+            self.assertEqual(list(plan.spans()), list(IntegrityPipe(m).plan_chunks(25).spans()))
+            if len(plan):
+                self.assertEqual(plan.ends[-1], len(m.atoms))
+
+    def test_rejects_inconsistent_offsets(self):
+        table = AtomTable.from_manifests([random_manifest(random.Random(1), 0)])
+        table.doc_offsets[-1] += 1
+        with self.assertRaises(ValueError):
+            BatchIntegrityPipe().plan_chunks(table, 10)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import os
+import random
+import unittest
+
+# Setup path to internal source
+sys.path.insert(0, os.path.abspath('src/python'))
+from aegis_integrity.aegis_integrity import (
+    GeometricAtom, BoundingBox, GeometricManifest, IntegrityPipe, StructuralRange, ChunkIndex
+)
+
+def create_mock_atom(index: int):
+    # 30 atoms per page, 3 per line
+    line = (index % 30) // 3
+    return GeometricAtom(
+        text=f"w{index}",
+        bounds=BoundingBox(100 * (index % 3), 20 * line, 50, 10),
+        page=1 + index // 30,
+        token_count=1,
+        index=index
+    )
+
+def build(overlap_tokens: int = 0):
+    atoms = [create_mock_atom(i) for i in range(120)]
+    manifest = GeometricManifest(atoms, [StructuralRange(40, 55, "Table")])
+    index = ChunkIndex()
+    chunks = list(IntegrityPipe(manifest, overlap_tokens=overlap_tokens).generate_chunks(25, index=index))
+    return chunks, index
+
+class TestChunkIndex(unittest.TestCase):
+    def test_atom_lookup_matches_linear_scan(self):
+        for overlap in (0, 7):
+            chunks, index = build(overlap)
+            self.assertEqual(len(index), len(chunks))
+            for atom_index in range(-1, 122):
+                expected = [i for i, c in enumerate(chunks) if c.start_index <= atom_index <= c.end_index]
+                self.assertEqual(index.chunks_for_atom(atom_index), expected)
+
+    def test_page_lookup(self):
+        chunks, index = build()
+        for page in range(1, 5):
+            lo, hi = (page - 1) * 30, page * 30 - 1
+            expected = [i for i, c in enumerate(chunks) if c.start_index <= hi and c.end_index >= lo]
+            self.assertEqual(index.chunks_for_page(page), expected)
+        self.assertEqual(index.chunks_for_page(9), [])
+
+    def test_region_lookup(self):
+        chunks, index = build()
+        # Bottom line of page 2 holds atoms 57-59
+        hits = index.chunks_for_region(2, BoundingBox(0, 180, 300, 5))
+        expected = [i for i, c in enumerate(chunks) if c.start_index <= 59 and c.end_index >= 57]
+        self.assertEqual(hits, expected)
+        self.assertEqual(index.chunks_for_region(2, BoundingBox(500, 500, 10, 10)), [])
+
+    def test_region_lookup_matches_linear_scan(self):
+        rng = random.Random(7)
+        atoms = [
+            GeometricAtom(f"w{i}", BoundingBox(rng.uniform(0, 500), rng.uniform(0, 700), rng.uniform(5, 80), rng.uniform(5, 40)),
+                          page=1, token_count=1, index=i)
+            for i in range(400)
+        ]
+        index = ChunkIndex()
+        chunks = list(IntegrityPipe(GeometricManifest(atoms, []), overlap_tokens=2).generate_chunks(6, index=index))
+
+        def touches(a, region):
+            b = a.bounds
+            return (b.x <= region.x + region.width and region.x <= b.x + b.width
+                    and b.y <= region.y + region.height and region.y <= b.y + b.height)
+
+        def linear(region):
+            return [
+                chunk_id for chunk_id, c in enumerate(chunks)
+                if any(touches(a, region) for a in atoms[c.start_index:c.end_index + 1])
+            ]
+
+        for _ in range(200):
+            region = BoundingBox(rng.uniform(0, 550), rng.uniform(0, 750), rng.uniform(0, 60), rng.uniform(0, 60))
+            self.assertEqual(index.chunks_for_region(1, region), linear(region))
+
+    def test_region_lookup_ignores_gaps_between_columns(self):
+        # Two columns of ten lines; one chunk runs from the bottom of column A into column B
+        atoms = [
+            GeometricAtom(f"w{i}", BoundingBox(0 if i < 10 else 400, 100 * (i % 10), 150, 20), page=1, token_count=1, index=i)
+            for i in range(20)
+        ]
+        index = ChunkIndex()
+        chunks = list(IntegrityPipe(GeometricManifest(atoms, [])).generate_chunks(6, index=index))
+        spanning = [i for i, c in enumerate(chunks) if c.start_index < 10 <= c.end_index]
+        self.assertEqual(len(spanning), 1)
+
+        self.assertEqual(index.chunks_for_region(1, BoundingBox(200, 500, 100, 10)), [])
+        self.assertIn(spanning[0], index.chunks_for_region(1, BoundingBox(400, 0, 10, 10)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import sys
+import os
+import json
+import unittest
+
+# Setup path to internal source
+sys.path.insert(0, os.path.abspath('src/python'))
+from aegis_integrity.aegis_integrity import (
+    GeometricAtom, BoundingBox, GeometricManifest, IntegrityPipe, StructuralRange, ChunkPlan, ChunkPlanCache
+)
+
+def create_mock_atom(index: int, text: str = "word", page: int = 1):
+    return GeometricAtom(
+        text=f"{text}{index}",
+        bounds=BoundingBox(0, 0, 10, 10),
+        page=page,
+        token_count=1,
+        index=index
+    )
+
+def create_manifest():
+    atoms = [create_mock_atom(i, page=1 + i // 40) for i in range(120)]
+    return GeometricManifest(atoms, [StructuralRange(20, 80, "Table")])
+
+class TestChunkPlan(unittest.TestCase):
+    def test_replayed_plan_matches_direct_chunking(self):
+        manifest = create_manifest()
+        pipe = IntegrityPipe(manifest, overlap_tokens=5)
+
+        expected = list(pipe.generate_chunks(target_tokens=30, hard_max_tokens=75))
+        plan = pipe.plan_chunks(target_tokens=30, hard_max_tokens=75)
+
+        self.assertEqual(plan.manifest_fingerprint, manifest.fingerprint())
+        self.assertEqual(list(pipe.replay_plan(plan)), expected)
+
+    def test_plan_round_trips_through_json(self):
+        manifest = create_manifest()
+        pipe = IntegrityPipe(manifest)
+        plan = pipe.plan_chunks(target_tokens=50, hard_max_tokens=75)
+
+        restored = ChunkPlan.from_dict(json.loads(json.dumps(plan.to_dict())))
+
+        self.assertEqual(restored.cache_key(), plan.cache_key())
+        self.assertEqual(list(restored.spans()), list(plan.spans()))
+        self.assertEqual(list(pipe.replay_plan(restored)), list(pipe.generate_chunks(50, 75)))
+
+    def test_cache_hit_skips_boundary_logic(self):
+        cache = ChunkPlanCache()
+        first = IntegrityPipe(create_manifest(), plan_cache=cache)
+        plan = first.plan_chunks(target_tokens=50, hard_max_tokens=75)
+
+        # An equal manifest built elsewhere shares the memoized plan.
+        second = IntegrityPipe(create_manifest(), plan_cache=cache)
+        second._build_plan = None  # Any recomputation would fail loudly
+        self.assertIs(second.plan_chunks(target_tokens=50, hard_max_tokens=75), plan)
+        self.assertEqual(len(list(second.generate_chunks(50, 75))), len(plan))
+        self.assertEqual(len(cache), 1)
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = ChunkPlanCache(max_entries=2)
+        pipe = IntegrityPipe(create_manifest(), plan_cache=cache)
+        oldest = pipe.plan_chunks(10)
+        pipe.plan_chunks(20)
+        pipe.plan_chunks(30)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(oldest.cache_key()))
+
+    def test_replay_rejects_foreign_manifest(self):
+        plan = IntegrityPipe(create_manifest()).plan_chunks(target_tokens=50)
+        other = GeometricManifest([create_mock_atom(i, "other") for i in range(100)], [])
+
+        with self.assertRaises(ValueError):
+            list(IntegrityPipe(other).replay_plan(plan))
+
+    def test_replay_rejects_changed_structures(self):
+        atoms = [create_mock_atom(i) for i in range(100)]
+        plan = IntegrityPipe(GeometricManifest(atoms, [])).plan_chunks(target_tokens=50)
+        restructured = GeometricManifest(list(atoms), [StructuralRange(40, 60, "Table")])
+
+        with self.assertRaises(ValueError):
+            list(IntegrityPipe(restructured).replay_plan(plan))
+
+    def test_replay_checks_caller_supplied_key(self):
+        manifest = create_manifest()
+        plan = IntegrityPipe(manifest, manifest_key="doc-7@v1").plan_chunks(50)
+
+        self.assertEqual(len(list(IntegrityPipe(manifest, manifest_key="doc-7@v1").replay_plan(plan))), len(plan))
+        with self.assertRaises(ValueError):
+            list(IntegrityPipe(manifest, manifest_key="doc-7@v2").replay_plan(plan))
+
+    def test_mutated_manifest_misses_the_cache(self):
+        cache = ChunkPlanCache()
+        manifest = create_manifest()
+        pipe = IntegrityPipe(manifest, plan_cache=cache)
+        before = pipe.plan_chunks(target_tokens=50)
+
+        manifest.atoms.extend(create_mock_atom(i) for i in range(120, 140))
+        after = pipe.plan_chunks(target_tokens=50)
+
+        self.assertIsNot(after, before)
+        self.assertEqual(after.ends[-1], 140)
+
+    def test_caller_supplied_manifest_key(self):
+        cache = ChunkPlanCache()
+        plan = IntegrityPipe(create_manifest(), plan_cache=cache, manifest_key="doc-7@v1").plan_chunks(50)
+
+        other = IntegrityPipe(create_manifest(), plan_cache=cache, manifest_key="doc-7@v1")
+        other.manifest.fingerprint = None  # The supplied key must be used instead of hashing
+        self.assertIs(other.plan_chunks(50), plan)
+        self.assertEqual(plan.manifest_fingerprint, "doc-7@v1")
+
+if __name__ == "__main__":
+    unittest.main()
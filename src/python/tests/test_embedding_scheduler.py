@@ -0,0 +1,116 @@
+import sys
+import os
+import asyncio
+import unittest
+
+# Setup path to internal source
+sys.path.insert(0, os.path.abspath('src/python'))
+from aegis_integrity.aegis_integrity import GeometricChunk
+from aegis_integrity.embedding_scheduler import EmbeddingBatchScheduler
+
+def create_chunk(i: int, tokens: int):
+    return GeometricChunk(f"chunk {i}", i, i, 1, tokens, "TargetReached")
+
+class FakeEmbedder:
+    """Local stand-in for an embedding endpoint."""
+    def __init__(self, failures: int = 0, delay: float = 0.01):
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, texts):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures > 0:
+                self.failures -= 1
+                raise ConnectionError("transient failure")
+            return [[float(len(t))] for t in texts]
+        finally:
+            self.active -= 1
+
+async def collect(scheduler, chunks):
+    return [batch async for batch in scheduler.embed(chunks)]
+
+class TestEmbeddingBatchScheduler(unittest.TestCase):
+    def test_batches_respect_budgets_and_fill_closely(self):
+        sizes = [300, 700, 120, 900, 50, 400, 600, 80, 1000, 250] * 5
+        chunks = [create_chunk(i, t) for i, t in enumerate(sizes)]
+        scheduler = EmbeddingBatchScheduler(FakeEmbedder(), max_batch_tokens=1000, max_batch_items=4, lookahead=16)
+
+        batches = list(scheduler.form_batches(chunks))
+
+        self.assertEqual(sorted(c.start_index for b in batches for c in b), list(range(len(chunks))))
+        self.assertTrue(all(len(b) <= 4 and sum(c.token_count for c in b) <= 1000 for b in batches))
+        # Lower bound is ceil(22000 / 1000) = 22 requests
+        self.assertLessEqual(len(batches), 25)
+
+    def test_small_chunks_fill_default_batches(self):
+        chunks = [create_chunk(i, 50) for i in range(960)]
+        scheduler = EmbeddingBatchScheduler(FakeEmbedder())
+
+        batches = list(scheduler.form_batches(chunks))
+
+        self.assertEqual(len(batches), 10)
+        self.assertTrue(all(len(b) == 96 for b in batches))
+
+    def test_embeds_stream_with_bounded_concurrency(self):
+        embedder = FakeEmbedder()
+        chunks = (create_chunk(i, 100) for i in range(200))
+        scheduler = EmbeddingBatchScheduler(embedder, max_batch_tokens=1000, max_batch_items=8, max_in_flight=3)
+
+        results = asyncio.run(collect(scheduler, chunks))
+
+        self.assertEqual(sum(len(r.chunks) for r in results), 200)
+        self.assertTrue(all(r.error is None and len(r.vectors) == len(r.chunks) for r in results))
+        self.assertEqual(embedder.peak, 3)
+        self.assertEqual(embedder.calls, 25)
+
+    def test_failed_batches_are_retried(self):
+        embedder = FakeEmbedder(failures=2)
+        scheduler = EmbeddingBatchScheduler(embedder, max_batch_tokens=500, max_in_flight=2, retry_backoff=0.001)
+
+        results = asyncio.run(collect(scheduler, [create_chunk(i, 100) for i in range(20)]))
+
+        self.assertTrue(all(r.error is None for r in results))
+        self.assertEqual(sum(r.attempts for r in results), len(results) + 2)
+
+    def test_exhausted_retries_are_reported_not_raised(self):
+        embedder = FakeEmbedder(failures=100)
+        scheduler = EmbeddingBatchScheduler(embedder, max_batch_tokens=500, max_retries=1, retry_backoff=0.001)
+
+        results = asyncio.run(collect(scheduler, [create_chunk(i, 100) for i in range(10)]))
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(isinstance(r.error, ConnectionError) and r.attempts == 2 for r in results))
+
+    def test_oversized_chunk_fails_without_retries(self):
+        embedder = FakeEmbedder()
+        scheduler = EmbeddingBatchScheduler(embedder, max_batch_tokens=500, retry_backoff=0.001)
+        chunks = [create_chunk(0, 100), create_chunk(1, 900), create_chunk(2, 100)]
+
+        results = asyncio.run(collect(scheduler, chunks))
+        failed = [r for r in results if r.error is not None]
+
+        self.assertEqual(len(failed), 1)
+        self.assertEqual([c.start_index for c in failed[0].chunks], [1])
+        self.assertIsInstance(failed[0].error, ValueError)
+        self.assertEqual(failed[0].attempts, 0)
+        self.assertEqual(embedder.calls, 1)
+
+    def test_accepts_async_chunk_streams(self):
+        async def stream():
+            for i in range(30):
+                yield create_chunk(i, 50)
+
+        scheduler = EmbeddingBatchScheduler(FakeEmbedder(), max_batch_tokens=400)
+        results = asyncio.run(collect(scheduler, stream()))
+
+        self.assertEqual(sum(len(r.chunks) for r in results), 30)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import os
+import subprocess
+import unittest
+import uuid
+
+# Setup path to internal source
+sys.path.insert(0, os.path.abspath('src/python'))
+from aegis_integrity.aegis_integrity import (
+    GeometricAtom, BoundingBox, GeometricManifest, IntegrityPipe, StructuralRange,
+    FrozenManifest, ManifestChunkingPool, ChunkPlanCache
+)
+
+def create_mock_atom(index: int):
+    return GeometricAtom(
+        text=f"wörd{index}",
+        bounds=BoundingBox(index * 1.5, 700 - index, 10, 12),
+        page=1 + index // 50,
+        token_count=1 + index % 3,
+        index=index
+    )
+
+def create_manifest():
+    atoms = [create_mock_atom(i) for i in range(150)]
+    return GeometricManifest(atoms, [StructuralRange(20, 60, "Table"), StructuralRange(100, 110, "List")])
+
+class TestFrozenManifest(unittest.TestCase):
+    def test_frozen_manifest_round_trips_atoms_and_structures(self):
+        manifest = create_manifest()
+        frozen = FrozenManifest.freeze(manifest)
+
+        self.assertEqual(list(frozen.atoms), manifest.atoms)
+        self.assertEqual(list(frozen.structures), manifest.structures)
+        self.assertEqual(list(frozen.get_structures_at(30)), manifest.get_structures_at(30))
+        self.assertEqual(frozen.fingerprint(), manifest.fingerprint())
+        self.assertIs(FrozenManifest.freeze(frozen), frozen)
+
+    def test_frozen_manifest_is_immutable(self):
+        frozen = FrozenManifest.freeze(create_manifest())
+
+        with self.assertRaises(AttributeError):
+            frozen.atoms = []
+        # Decoded atoms are fresh objects: mutating one never leaks into other readers.
+        frozen.atoms[0].text = "mutated"
+        self.assertEqual(frozen.atoms[0].text, "wörd0")
+
+    def test_chunks_match_mutable_manifest(self):
+        manifest = create_manifest()
+        expected = list(IntegrityPipe(manifest, overlap_tokens=4).generate_chunks(40, 80))
+        actual = list(IntegrityPipe(FrozenManifest.freeze(manifest), overlap_tokens=4).generate_chunks(40, 80))
+
+        self.assertEqual(actual, expected)
+
+    def test_shared_memory_attach(self):
+        frozen = FrozenManifest.freeze(create_manifest())
+        block = frozen.to_shared_memory(name=f"aegis_{uuid.uuid4().hex[:12]}")
+        try:
+            attached = FrozenManifest.attach(block.name)
+            self.assertEqual(list(attached.atoms), list(frozen.atoms))
+            self.assertEqual(
+                list(IntegrityPipe(attached).generate_chunks(40)),
+                list(IntegrityPipe(frozen).generate_chunks(40))
+            )
+            attached.close()
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_shared_memory_survives_worker_processes(self):
+        frozen = FrozenManifest.freeze(create_manifest())
+        block = frozen.to_shared_memory(name=f"aegis_{uuid.uuid4().hex[:12]}")
+        worker = (
+            "import sys; sys.path.insert(0, sys.argv[2]);"
+            "from aegis_integrity.aegis_integrity import FrozenManifest, IntegrityPipe;"
+            "m = FrozenManifest.attach(sys.argv[1]);"
+            "print(len(list(IntegrityPipe(m).generate_chunks(40))));"
+            "m.close()"
+        )
+        source = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        expected = str(len(list(IntegrityPipe(frozen).generate_chunks(40))))
+        try:
+            # Attach from two processes in turn: the first exiting must not unlink the block.
+            for _ in range(2):
+                result = subprocess.run([sys.executable, "-c", worker, block.name, source],
+                                        capture_output=True, text=True, timeout=60)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(result.stdout.strip(), expected)
+                self.assertNotIn("leaked", result.stderr)
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_thread_pool_serves_many_requests(self):
+        manifest = create_manifest()
+        targets = [20, 30, 40, 50] * 4
+
+        with ManifestChunkingPool(manifest, max_workers=4, plan_cache=ChunkPlanCache()) as pool:
+            results = list(pool.map(targets))
+
+        for target, chunks in zip(targets, results):
+            self.assertEqual(chunks, list(IntegrityPipe(manifest).generate_chunks(target)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys
+import os
+import random
+import unittest
+
+# Setup path to internal source
+sys.path.insert(0, os.path.abspath('src/python'))
+from aegis_integrity.aegis_integrity import (
+    GeometricAtom, BoundingBox, GridLawDetector, IncrementalGridLawDetector, StructuralRange
+)
+
+def random_page(rng: random.Random, page: int, start: int, shuffle: bool):
+    atoms = []
+    column_x = [rng.uniform(50, 500) for _ in range(rng.randint(2, 4))]
+    for line in range(rng.randint(1, 20)):
+        y = 800 - 12 * line
+        if rng.random() < 0.5:
+            xs = [x + rng.uniform(-6, 6) for x in column_x]
+        else:
+            xs = [rng.uniform(50, 550) for _ in range(rng.randint(1, 5))]
+        for x in xs:
+            atoms.append(GeometricAtom(f"w{start + len(atoms)}", BoundingBox(x, y, 8, 8), page, 1, start + len(atoms)))
+    if shuffle:
+        rng.shuffle(atoms)
+    return atoms
+
+def random_document(rng: random.Random, pages: int, shuffle: bool):
+    atoms = []
+    for page in range(1, pages + 1):
+        atoms += random_page(rng, page, len(atoms), shuffle and rng.random() < 0.5)
+    return atoms
+
+class TestIncrementalGridLaw(unittest.TestCase):
+    def test_matches_full_rerun_for_any_append_pattern(self):
+        rng = random.Random(17)
+        for trial in range(40):
+            atoms = random_document(rng, rng.randint(1, 6), shuffle=bool(trial % 2))
+            direction = rng.choice(["LTR", "RTL"])
+            detector = IncrementalGridLawDetector(direction)
+
+            position = 0
+            emitted = []
+            while position < len(atoms):
+                step = rng.randint(1, 40)
+                emitted += detector.append(atoms[position:position + step])
+                position += step
+            emitted += detector.finish()
+
+            expected = GridLawDetector().detect_document_zones(atoms, direction)
+            self.assertEqual(emitted, expected)
+            self.assertEqual(detector.zones, expected)
+
+    def test_tail_zone_extends_before_page_closes(self):
+        atoms = [
+            GeometricAtom(f"c{r}{c}", BoundingBox(100 * c, 700 - 20 * r, 8, 8), 1, 1, 3 * r + c)
+            for r in range(4) for c in range(3)
+        ]
+        detector = IncrementalGridLawDetector()
+
+        detector.append(atoms[:9])
+        self.assertEqual(detector.open_zones, [StructuralRange(0, 5, "Table")])
+        detector.append(atoms[9:])
+        self.assertEqual(detector.open_zones, [StructuralRange(0, 8, "Table")])
+        self.assertEqual(detector.finish(), [StructuralRange(0, 11, "Table")])
+
+    def test_rows_never_merge_across_pages(self):
+        # The same three-column table on two pages, rows at identical Y positions
+        atoms = [
+            GeometricAtom(f"w{12 * (page - 1) + 3 * r + c}", BoundingBox(100 * c + 40 * (page - 1), 800 - 12 * r, 8, 8),
+                          page, 1, 12 * (page - 1) + 3 * r + c)
+            for page in (1, 2) for r in range(4) for c in range(3)
+        ]
+        detector = IncrementalGridLawDetector()
+        zones = detector.append(atoms) + detector.finish()
+
+        self.assertEqual(zones, [StructuralRange(0, 11, "Table"), StructuralRange(12, 23, "Table")])
+        # A whole-list detect_table_zones run pairs rows across pages and merges both tables
+        self.assertEqual(GridLawDetector().detect_table_zones(atoms, "LTR"), [StructuralRange(0, 23, "Table")])
+
+    def test_pages_must_arrive_contiguously(self):
+        atom = lambda i, page: GeometricAtom("w", BoundingBox(0, 0, 8, 8), page, 1, i)
+        detector = IncrementalGridLawDetector()
+        detector.append([atom(0, 1), atom(1, 2)])
+        with self.assertRaises(ValueError):
+            detector.append([atom(2, 1)])
+
+if __name__ == "__main__":
+    unittest.main()
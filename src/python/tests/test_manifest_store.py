@@ -0,0 +1,158 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# Setup path to internal source
+sys.path.insert(0, os.path.abspath('src/python'))
+from aegis_integrity.aegis_integrity import (
+    GeometricAtom, BoundingBox, GeometricManifest, IntegrityPipe, StructuralRange
+)
+from aegis_integrity import manifest_store
+from aegis_integrity.manifest_store import ManifestStore
+
+def create_manifest(doc: int, size: int = 40):
+    atoms = [
+        GeometricAtom(text=f"d{doc}w{i}", bounds=BoundingBox(i, doc, 5, 5), page=1, token_count=1 + i % 2, index=i)
+        for i in range(size)
+    ]
+    return GeometricManifest(atoms, [StructuralRange(5, 15, "Table")])
+
+class TestManifestStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_batched_writes_and_random_reads(self):
+        with ManifestStore(self.root) as store:
+            self.assertEqual(store.append_batch((f"doc-{i}", create_manifest(i)) for i in range(50)), 50)
+            manifest = store.get("doc-17")
+
+            self.assertEqual(len(store), 50)
+            self.assertEqual(list(manifest.atoms), create_manifest(17).atoms)
+            self.assertEqual(list(manifest.structures), [StructuralRange(5, 15, "Table")])
+            self.assertEqual(
+                list(IntegrityPipe(manifest).generate_chunks(10)),
+                list(IntegrityPipe(create_manifest(17)).generate_chunks(10))
+            )
+            with self.assertRaises(KeyError):
+                store.get("missing")
+
+    def test_segments_roll_and_survive_reopen(self):
+        with ManifestStore(self.root, max_segment_bytes=8 * 1024) as store:
+            store.append_batch((f"doc-{i}", create_manifest(i)) for i in range(30))
+
+        segments = [n for n in os.listdir(self.root) if n.endswith(".agm")]
+        self.assertGreater(len(segments), 1)
+
+        with ManifestStore(self.root, max_segment_bytes=8 * 1024) as store:
+            self.assertEqual(len(store), 30)
+            self.assertEqual(list(store.get("doc-29").atoms), create_manifest(29).atoms)
+            store.put("doc-30", create_manifest(30))
+            self.assertIn("doc-30", store)
+
+    def test_scan_yields_live_records_in_order(self):
+        with ManifestStore(self.root) as store:
+            store.append_batch((f"doc-{i}", create_manifest(i)) for i in range(5))
+            store.put("doc-2", create_manifest(99, size=12))
+
+            scanned = [(doc_id, len(m.atoms)) for doc_id, m in store.scan()]
+
+        self.assertEqual([d for d, _ in scanned], ["doc-0", "doc-1", "doc-3", "doc-4", "doc-2"])
+        self.assertEqual(dict(scanned)["doc-2"], 12)
+
+    def test_scan_skips_torn_segment_records(self):
+        with ManifestStore(self.root) as store:
+            store.append_batch((f"doc-{i}", create_manifest(i)) for i in range(3))
+        segment = [n for n in os.listdir(self.root) if n.endswith(".agm")][0]
+        with open(os.path.join(self.root, segment), "ab") as handle:
+            handle.write(b"AGR1\x05\x00\x00\x00partial")
+
+        with ManifestStore(self.root) as store:
+            store.append_batch((f"doc-{i}", create_manifest(i)) for i in range(3, 6))
+            scanned = [doc_id for doc_id, _ in store.scan()]
+
+        self.assertEqual(scanned, [f"doc-{i}" for i in range(6)])
+
+    def test_torn_index_tail_is_discarded(self):
+        with ManifestStore(self.root) as store:
+            store.append_batch((f"doc-{i}", create_manifest(i)) for i in range(3))
+        with open(os.path.join(self.root, ManifestStore.INDEX_NAME), "ab") as handle:
+            handle.write(b"\x01\x02\x03")
+
+        with ManifestStore(self.root) as store:
+            self.assertEqual(len(store), 3)
+            store.put("doc-3", create_manifest(3))
+        with ManifestStore(self.root) as store:
+            self.assertEqual(sorted(store.doc_ids()), ["doc-0", "doc-1", "doc-2", "doc-3"])
+
+    def test_readonly_reader_never_truncates_or_writes(self):
+        writer = ManifestStore(self.root)
+        writer.append_batch((f"doc-{i}", create_manifest(i)) for i in range(3))
+        index_path = os.path.join(self.root, ManifestStore.INDEX_NAME)
+        with open(index_path, "ab") as handle:
+            handle.write(b"\x01\x02\x03")
+        size = os.path.getsize(index_path)
+
+        with ManifestStore(self.root, readonly=True) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(os.path.getsize(index_path), size)
+            with self.assertRaises(ValueError):
+                reader.put("doc-9", create_manifest(9))
+        writer.close()
+
+    def test_readonly_reader_sees_later_appends(self):
+        with ManifestStore(self.root) as writer:
+            writer.append_batch((f"doc-{i}", create_manifest(i)) for i in range(3))
+            with ManifestStore(self.root, readonly=True) as reader:
+                writer.append_batch((f"doc-{i}", create_manifest(i)) for i in range(3, 5))
+                self.assertEqual(list(reader.get("doc-4").atoms), create_manifest(4).atoms)
+                self.assertEqual(len(reader), 5)
+                writer.put("doc-5", create_manifest(5))
+                self.assertEqual(reader.refresh(), 1)
+                self.assertIn("doc-5", reader)
+
+    def test_snapshot_combines_with_log_tail(self):
+        with ManifestStore(self.root) as store:
+            store.append_batch((f"doc-{i}", create_manifest(i)) for i in range(20))
+        self.assertTrue(os.path.exists(os.path.join(self.root, ManifestStore.SNAPSHOT_NAME)))
+
+        with ManifestStore(self.root) as store:
+            store.put("doc-3", create_manifest(99, size=12))
+            store.put("doc-20", create_manifest(20))
+            with ManifestStore(self.root, readonly=True) as reader:
+                self.assertEqual(len(reader), 21)
+                self.assertEqual(len(reader.get("doc-3").atoms), 12)
+                self.assertEqual(list(reader.get("doc-7").atoms), create_manifest(7).atoms)
+                self.assertEqual(sorted(reader.doc_ids()), sorted(f"doc-{i}" for i in range(21)))
+
+        with ManifestStore(self.root, readonly=True) as reader:
+            scanned = [doc_id for doc_id, _ in reader.scan()]
+        self.assertEqual(scanned, [f"doc-{i}" for i in range(20) if i != 3] + ["doc-3", "doc-20"])
+
+    def test_snapshot_hits_resolve_without_file_io(self):
+        with ManifestStore(self.root) as store:
+            store.append_batch((f"doc-{i}", create_manifest(i)) for i in range(50))
+
+        with ManifestStore(self.root, readonly=True) as reader:
+            reader.get("doc-0")  # Maps the segment
+            with mock.patch("builtins.open", side_effect=AssertionError("unexpected file I/O")):
+                for i in range(50):
+                    self.assertEqual(reader.get(f"doc-{i}").atoms[0], create_manifest(i).atoms[0])
+                self.assertNotIn("doc-50", reader)
+
+    def test_snapshot_hash_collisions_are_resolved_by_doc_id(self):
+        with mock.patch.object(manifest_store, "_id_hash", lambda raw_id: 42):
+            with ManifestStore(self.root) as store:
+                store.append_batch((f"doc-{i}", create_manifest(i)) for i in range(10))
+            with ManifestStore(self.root, readonly=True) as reader:
+                self.assertEqual(len(reader), 10)
+                self.assertEqual(list(reader.get("doc-6").atoms), create_manifest(6).atoms)
+                self.assertNotIn("doc-10", reader)
+
+if __name__ == "__main__":
+    unittest.main()
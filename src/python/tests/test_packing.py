@@ -0,0 +1,101 @@
+import sys
+import os
+import random
+import unittest
+
+# Setup path to internal source
+sys.path.insert(0, os.path.abspath('src/python'))
+from aegis_integrity.aegis_integrity import (
+    GeometricAtom, BoundingBox, GeometricManifest, IntegrityPipe, StructuralRange
+)
+
+def create_mock_atom(index: int, token_count: int = 1):
+    return GeometricAtom(
+        text=f"w{index}",
+        bounds=BoundingBox(0, 0, 10, 10),
+        page=1,
+        token_count=token_count,
+        index=index
+    )
+
+def table_dense_manifest():
+    # Alternating 15-atom prose runs and 30-atom tables
+    atoms = [create_mock_atom(i) for i in range(450)]
+    structures = [StructuralRange(start, start + 29, "Table") for start in range(15, 450, 45)]
+    return GeometricManifest(atoms, structures)
+
+def min_chunk_count(tokens, structures, hard_max):
+    # Reference DP over every allowed cut position
+    n = len(tokens)
+    blocked = set()
+    for s in structures:
+        if sum(tokens[s.start:s.end + 1]) <= hard_max:
+            blocked.update(range(s.start + 1, s.end + 1))
+    allowed = [c for c in range(n + 1) if c not in blocked]
+    best = [0] + [None] * n
+    for c in allowed[1:]:
+        for p in allowed:
+            if p >= c or best[p] is None:
+                continue
+            # Oversized runs with no allowed cut inside them are forced into one chunk
+            if sum(tokens[p:c]) <= hard_max or c == allowed[allowed.index(p) + 1]:
+                if best[c] is None or best[p] + 1 < best[c]:
+                    best[c] = best[p] + 1
+    return best[n]
+
+class TestPackedStrategy(unittest.TestCase):
+    def test_packing_reduces_chunk_count(self):
+        manifest = table_dense_manifest()
+        pipe = IntegrityPipe(manifest)
+
+        greedy = list(pipe.generate_chunks(target_tokens=50, hard_max_tokens=75))
+        packed = list(pipe.generate_chunks(target_tokens=50, hard_max_tokens=75, strategy="packed"))
+
+        self.assertLess(len(packed), len(greedy))
+        self.assertTrue(all(c.token_count <= 75 for c in packed))
+        self.assertEqual(sum(c.token_count for c in packed), 450)
+
+    def test_packing_never_splits_preservable_structures(self):
+        manifest = table_dense_manifest()
+        plan = IntegrityPipe(manifest).plan_chunks(target_tokens=50, hard_max_tokens=75, strategy="packed")
+
+        for s in manifest.structures:
+            for end in plan.ends:
+                self.assertFalse(s.start < end <= s.end)
+        self.assertEqual(plan.strategy, "packed")
+
+    def test_oversized_structure_is_soft_broken(self):
+        atoms = [create_mock_atom(i) for i in range(200)]
+        manifest = GeometricManifest(atoms, [StructuralRange(0, 199, "Table")])
+        chunks = list(IntegrityPipe(manifest).generate_chunks(50, 75, strategy="packed"))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertTrue(all(c.token_count <= 75 for c in chunks))
+        self.assertTrue(chunks[0].discriminator.startswith("SoftBreak"))
+
+    def test_packing_is_optimal_on_random_documents(self):
+        rng = random.Random(7)
+        for _ in range(40):
+            n = rng.randint(1, 40)
+            tokens = [rng.randint(1, 9) for _ in range(n)]
+            atoms = [create_mock_atom(i, t) for i, t in enumerate(tokens)]
+            structures = []
+            for _ in range(rng.randint(0, 3)):
+                start = rng.randrange(n)
+                structures.append(StructuralRange(start, min(n - 1, start + rng.randint(0, 8)), "Table"))
+            manifest = GeometricManifest(atoms, structures)
+
+            plan = IntegrityPipe(manifest).plan_chunks(10, 20, strategy="packed")
+
+            self.assertEqual(len(plan), min_chunk_count(tokens, structures, 20))
+            self.assertEqual(plan.starts[0], 0)
+            self.assertEqual(plan.ends[-1], n)
+            self.assertEqual(list(plan.starts[1:]), list(plan.ends[:-1]))
+
+    def test_packing_rejects_overlap(self):
+        pipe = IntegrityPipe(table_dense_manifest(), overlap_tokens=5)
+        with self.assertRaises(ValueError):
+            pipe.plan_chunks(50, strategy="packed")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import sys
+import os
+import random
+import unittest
+
+# Setup path to internal source
+sys.path.insert(0, os.path.abspath('src/python'))
+from aegis_integrity.aegis_integrity import GeometricAtom, BoundingBox, GridLawDetector
+
+def create_atom(index: int, x: float, y: float, page: int = 1):
+    return GeometricAtom(text=f"w{index}", bounds=BoundingBox(x, y, 8, 8), page=page, token_count=1, index=index)
+
+def prose_page(page: int, start: int, lines: int = 30):
+    # One atom per line (line-level extraction) or ragged word runs with no repeated shape
+    atoms = []
+    for line in range(lines):
+        y = 800 - 14 * line
+        words = 1 if line % 2 else 2 + line
+        for w in range(words):
+            atoms.append(create_atom(start + len(atoms), 72 + 23 * w + (line % 3), y, page))
+    return atoms
+
+def table_page(page: int, start: int):
+    atoms = prose_page(page, start, lines=4)
+    for row in range(5):
+        for col in range(4):
+            atoms.append(create_atom(start + len(atoms), 72 + 120 * col, 700 - 14 * row, page))
+    return atoms
+
+def random_page(rng: random.Random, page: int, start: int):
+    atoms = []
+    column_x = [rng.uniform(50, 500) for _ in range(rng.randint(2, 5))]
+    for line in range(rng.randint(1, 25)):
+        y = 800 - 12 * line
+        if rng.random() < 0.4:
+            xs = [x + rng.uniform(-7, 7) for x in column_x]
+        else:
+            xs = [rng.uniform(50, 550) for _ in range(rng.randint(1, 6))]
+        for x in xs:
+            atoms.append(create_atom(start + len(atoms), x, y, page))
+    rng.shuffle(atoms)
+    return atoms
+
+class TestPagePrefilter(unittest.TestCase):
+    def test_prose_pages_are_skipped_and_tables_routed(self):
+        atoms = prose_page(1, 0)
+        atoms += table_page(2, len(atoms))
+        detector = GridLawDetector()
+
+        profiles = detector.classify_pages(atoms)
+
+        self.assertEqual([p.page for p in profiles], [1, 2])
+        self.assertFalse(profiles[0].may_contain_table)
+        self.assertTrue(profiles[1].may_contain_table)
+        self.assertEqual(profiles[1].max_atoms_per_row, 4)
+        self.assertEqual(len(detector.detect_document_zones(atoms)), 1)
+
+    def test_prefilter_never_drops_a_table(self):
+        rng = random.Random(31)
+        detector = GridLawDetector()
+        for trial in range(300):
+            atoms = random_page(rng, 1, 0)
+            for direction in ("LTR", "RTL"):
+                self.assertEqual(
+                    detector.detect_table_zones(atoms, direction),
+                    detector.detect_table_zones(atoms, direction, prefilter=False)
+                )
+
+    def test_document_zones_match_per_page_detection(self):
+        rng = random.Random(5)
+        atoms = []
+        for page in range(1, 30):
+            atoms += random_page(rng, page, len(atoms)) if page % 3 else prose_page(page, len(atoms))
+        detector = GridLawDetector()
+
+        expected = []
+        for page in range(1, 30):
+            expected += detector.detect_table_zones([a for a in atoms if a.page == page], prefilter=False)
+
+        self.assertEqual(detector.detect_document_zones(atoms), expected)
+
+if __name__ == "__main__":
+    unittest.main()